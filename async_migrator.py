@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Async workbook transfer for the Tableau Server Migration Tool
+
+Downloads workbooks from the source server and publishes them to the target
+server over aiohttp, so many transfers can be in flight without a thread each.
+Sign-in and project/workbook lookups stay with TableauMigrator; this module
+only reuses the auth tokens of its source and target connections.
+AsyncTableauMigrator runs project and site migrations this way (--async).
+"""
+
+import os
+import ssl
+import asyncio
+import hashlib
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+from tableau_migration import (TableauMigrator, DOWNLOAD_CHUNK_SIZE, ZIP_MAGIC, _SAFE_FILENAME_TABLE,
+                               _publish_requests)
+
+
+class AsyncWorkbookTransfer:
+    """Copy workbooks between the connected servers of a TableauMigrator using aiohttp"""
+
+    def __init__(self, migrator, concurrency=8, connection_limit=50):
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError("aiohttp is required for async transfers. Install with: pip install aiohttp")
+        self.migrator = migrator
+        self.logger = migrator.logger
+        self.concurrency = concurrency
+        self.connection_limit = connection_limit
+
+    def _session(self, server):
+        """Open a pooled session that signs every request with the auth token of ``server``"""
+        verify = server.http_options.get('verify', True)
+        if verify is False:
+            connector = aiohttp.TCPConnector(limit=self.connection_limit, ssl=False)
+        elif isinstance(verify, str):
+            connector = aiohttp.TCPConnector(limit=self.connection_limit,
+                                             ssl=ssl.create_default_context(cafile=verify))
+        else:
+            connector = aiohttp.TCPConnector(limit=self.connection_limit)
+        return aiohttp.ClientSession(connector=connector, headers={'X-Tableau-Auth': server.auth_token})
+
+    @staticmethod
+    async def _check_status(response):
+        if response.status >= 400:
+            raise RuntimeError(f"{response.method} {response.url} failed with HTTP {response.status}: "
+                               f"{await response.text()}")
+
+    async def download(self, session, workbook):
+        """Stream a workbook's content into the migrator's temp directory, returning the file path
+
+        As in TableauMigrator._download_workbook, an unchanged copy kept by
+        --keep-files is reused, new downloads wait while those awaiting upload
+        exceed the disk budget, and the content goes to a .part file that only
+        gets the workbook's name once complete. File writes run off the event loop.
+        """
+        migrator = self.migrator
+        if migrator._manifest:
+            cached_file = migrator._manifest.get(workbook.id, workbook.updated_at)
+            if cached_file:
+                self.logger.info("Workbook %s is unchanged since it was downloaded to %s", workbook.name, cached_file)
+                return cached_file
+
+        async with self._disk_space_freed:
+            if migrator._over_disk_budget():
+                self.logger.info("Waiting for uploads to free space in %s", migrator.temp_dir)
+            await self._disk_space_freed.wait_for(lambda: not migrator._over_disk_budget())
+
+        url = f"{migrator.source_server.workbooks.baseurl}/{workbook.id}/content"
+        params = None if migrator.include_extract else {'includeExtract': 'False'}
+        safe_filename = f"workbook_{workbook.id}".translate(_SAFE_FILENAME_TABLE)
+        part_file = os.path.join(migrator.temp_dir, f"{safe_filename}.part")
+        workbook_file = None
+        digest = hashlib.sha256()
+
+        def write(chunk):
+            f.write(chunk)
+            digest.update(chunk)
+
+        def finish():
+            f.flush()
+            os.fsync(f.fileno())
+            f.close()
+
+        f = await asyncio.to_thread(open, part_file, 'wb')
+        try:
+            async with session.get(url, params=params) as response:
+                await self._check_status(response)
+                async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                    if workbook_file is None:
+                        ext = '.twbx' if chunk.startswith(ZIP_MAGIC) else '.twb'
+                        workbook_file = os.path.join(migrator.temp_dir, f"{safe_filename}{ext}")
+                    await asyncio.to_thread(write, chunk)
+            if workbook_file is None:
+                raise IOError(f"Empty download for workbook {workbook.id}")
+            await asyncio.to_thread(finish)
+            os.replace(part_file, workbook_file)
+        except BaseException:
+            f.close()
+            if os.path.exists(part_file):
+                os.remove(part_file)
+            raise
+
+        sha256 = digest.hexdigest()
+        migrator._file_digests[workbook_file] = sha256
+        migrator._track_pending_file(workbook_file)
+        if migrator._manifest:
+            migrator._manifest.put(workbook.id, workbook.updated_at, workbook_file, sha256)
+        return workbook_file
+
+    @staticmethod
+    async def _body_chunks(body):
+        """Yield the chunks of a _StreamingMultipart, reading its file part off the event loop"""
+        chunks = iter(body)
+        while (chunk := await asyncio.to_thread(next, chunks, None)) is not None:
+            yield chunk
+
+    async def _request(self, session, method, url, body):
+        """Send one request from _publish_requests, returning the response body"""
+        headers = None
+        if body is not None:
+            # With a Content-Length aiohttp sends the streamed body as is, not chunked
+            headers = {'Content-Type': body.content_type, 'Content-Length': str(len(body))}
+            body = self._body_chunks(body)
+        async with session.request(method, url, data=body, headers=headers) as response:
+            await self._check_status(response)
+            return await response.read()
+
+    async def _publish(self, session, workbook_name, workbook_file, target_project_id, overwrite):
+        steps = _publish_requests(self.migrator.target_server, workbook_name, target_project_id,
+                                  workbook_file, overwrite)
+        content = None
+        while True:
+            try:
+                method, url, body = steps.send(content)
+            except StopIteration:
+                return self.migrator._published_item(content)
+            content = await self._request(session, method, url, body)
+
+    async def publish(self, session, workbook_name, workbook_file, target_project_id):
+        """Publish a downloaded workbook to a target project, overwriting any existing copy
+
+        Sends the same requests as TableauMigrator._stream_publish and, like
+        _publish_workbook, retries a failed overwrite as a new workbook. Returns
+        the published WorkbookItem, or None if the response has none.
+        """
+        try:
+            return await self._publish(session, workbook_name, workbook_file, target_project_id, overwrite=True)
+        except Exception as e:
+            self.logger.error("Error publishing workbook %s: %s", workbook_name, e)
+            self.logger.info("Trying alternative publish mode...")
+            return await self._publish(session, workbook_name, workbook_file, target_project_id, overwrite=False)
+
+    async def _migrate_one(self, source_session, target_session, semaphore, workbook, target_project_id):
+        async with semaphore:
+            workbook_file = None
+            try:
+                self.logger.info("Downloading workbook %s (ID: %s)", workbook.name, workbook.id)
+                workbook_file = await self.download(source_session, workbook)
+                sha256 = await asyncio.to_thread(self.migrator._file_sha256, workbook_file)
+                # These may list the target project through TSC or read the
+                # published.json state file, so they run off the event loop
+                if await asyncio.to_thread(self.migrator._content_unchanged, workbook, target_project_id, sha256):
+                    return
+                self.logger.info("Uploading workbook %s to target project %s", workbook.name, target_project_id)
+                published = await self.publish(target_session, workbook.name, workbook_file, target_project_id)
+                await asyncio.to_thread(self.migrator._record_published, workbook, target_project_id, sha256,
+                                        published)
+                self.logger.info("Successfully migrated workbook %s", workbook.name)
+            finally:
+                self.migrator._remove_temp_file(workbook_file)
+                async with self._disk_space_freed:
+                    self._disk_space_freed.notify_all()
+
+    async def migrate_workbooks(self, workbooks, target_project_id):
+        """Migrate workbooks into a target project, up to ``concurrency`` at a time
+
+        Returns the names of the workbooks that failed.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        # Notified whenever a workbook file is removed, for downloads waiting on the disk budget
+        self._disk_space_freed = asyncio.Condition()
+        async with self._session(self.migrator.source_server) as source_session, \
+                self._session(self.migrator.target_server) as target_session:
+            results = await asyncio.gather(
+                *(self._migrate_one(source_session, target_session, semaphore, wb, target_project_id)
+                  for wb in workbooks),
+                return_exceptions=True
+            )
+
+        failed = []
+        for workbook, result in zip(workbooks, results):
+            if isinstance(result, Exception):
+                failed.append(workbook.name)
+                self.logger.error("Failed to migrate workbook %s: %s", workbook.name, result)
+        return failed
+
+    def run(self, workbooks, target_project_id):
+        """Blocking entry point for migrate_workbooks"""
+        if not self.migrator.source_server or not self.migrator.target_server:
+            self.migrator.connect()
+        return asyncio.run(self.migrate_workbooks(workbooks, target_project_id))
+
+
+class AsyncTableauMigrator(TableauMigrator):
+    """TableauMigrator that copies each project's workbooks with AsyncWorkbookTransfer
+
+    Sign-in, listing and project creation stay on the synchronous TSC code; only
+    the workbook downloads and publishes go over aiohttp, up to max_workers at a
+    time. migrate_site migrates each project through migrate_project, so it takes
+    this path as well.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.transfer = AsyncWorkbookTransfer(self, concurrency=self.max_workers)
+
+    def _migrate_workbooks(self, workbooks, source_project, target_project_id):
+        self.logger.info("Migrating %s workbooks over aiohttp, %s at a time", len(workbooks), self.max_workers)
+        failed = self.transfer.run(workbooks, target_project_id)
+        if failed:
+            raise RuntimeError(f"{len(failed)} of {len(workbooks)} workbooks failed to migrate "
+                               f"from project {source_project.name}: {', '.join(failed)}")
@@ -4,13 +4,30 @@ Automates exporting a single Tableau workbook, zipping it and uploading to Nexus
 """
 import os
 import sys
+import time
+import base64
+import shutil
+import stat
+import getpass
+import hashlib
+import mmap
+import uuid
+import secrets
 import zipfile
 import tempfile
 import logging
+import http.client
+import urllib.parse
+import itertools
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import requests
-from github import Github
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from github import Github, GithubException, InputGitTreeElement, RateLimitExceededException
 from dotenv import load_dotenv
 
 # --- Setup Logging ---
@@ -40,117 +57,778 @@ GITHUB_TOKEN = os.environ.get('GITHUB_TOKEN')
 GITHUB_REPO = os.environ.get('GITHUB_REPO')  # e.g. 'yourorg/yourrepo'
 
 # --- Import TableauMigrator ---
-import importlib.util
-spec = importlib.util.spec_from_file_location('tableau_migration', 'tableau_migration.py')
-tableau_migration = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(tableau_migration)
-TableauMigrator = tableau_migration.TableauMigrator
+# tableau_migration.py sits next to this script; a regular import lets Python
+# cache the module and reuse its compiled bytecode. tableauserverclient is
+# imported through its _tsc() on first use, so --help doesn't load it.
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from tableau_migration import TableauMigrator, _tsc
 
+# Read/write size used when streaming workbook content
+CHUNK_SIZE = 1 << 20  # 1 MiB
+# Leading bytes of a zip archive, i.e. a packaged (.twbx) workbook
+ZIP_MAGIC = b'PK\x03\x04'
+# Chunk size used when sending files to Nexus
+UPLOAD_CHUNK_SIZE = 1 << 22  # 4 MiB
+# Transient server errors that HTTP requests are retried on, and how often
+RETRY_STATUSES = (502, 503, 504)
+MAX_RETRIES = 5
+# Redirects followed by sendfile uploads, which keep the PUT like requests does
+REDIRECT_STATUSES = (301, 302, 307, 308)
+MAX_REDIRECTS = 5
+# Seconds a sendfile upload waits on a stalled Nexus connection before giving up
+SENDFILE_TIMEOUT = 60
 
-def download_tableau_workbook(migrator, workbook_name, source_project_id_or_name, download_dir):
-    '''Downloads one workbook by name from Tableau using TableauMigrator.'''
-    migrator.connect_to_source()
-    # If project argument looks like an ID, prefer ID, else treat as name
-    project_id = None
-    if len(source_project_id_or_name) > 20:  # likely a UUID
+# Cached lowercased project name -> ID maps, keyed by (server URL, site)
+_project_indexes = {}
+
+# Attempts made for a GitHub call that keeps hitting rate limits
+GITHUB_MAX_ATTEMPTS = 6
+
+# Per-run download directories live here and are reaped by later runs. Each
+# user gets their own root, as the temp directory is shared.
+DOWNLOAD_ROOT = os.path.join(tempfile.gettempdir(), 'tableau-autoexport-'
+                             + (str(os.getuid()) if hasattr(os, 'getuid') else getpass.getuser()))
+# Download directories older than this (in seconds) are considered abandoned
+STALE_DOWNLOAD_DIR_AGE = 6 * 60 * 60
+# Holds the ID of the process using a download directory; removed when it exits
+DOWNLOAD_DIR_PID_FILE = '.pid'
+# Seconds main() waits at exit for the reaper to finish the directory it is on
+REAPER_JOIN_TIMEOUT = 30
+
+
+def zip_compression_for(filepath):
+    '''Returns the (compression, compresslevel) pair to zip a workbook file with.
+
+    Packaged .twbx workbooks are already zip archives, so they are stored as-is;
+    anything else (plain .twb XML) gets a fast DEFLATE pass.
+    '''
+    if os.path.splitext(filepath)[1].lower() == '.twbx':
+        return zipfile.ZIP_STORED, None
+    return zipfile.ZIP_DEFLATED, 1
+
+
+def use_isal_for_zip():
+    '''Routes zipfile's DEFLATE and CRC32 through ISA-L's SIMD-accelerated versions.
+
+    zipfile looks both up as module globals at call time, so this affects every
+    zip the process reads or writes from then on, not just the workbook zips.
+    It is only done when asked for with --isal. Returns False, leaving zlib in
+    place, when the isal package is not installed.
+    '''
+    try:
+        from isal import isal_zlib
+    except ImportError:
+        return False
+    zipfile.zlib = isal_zlib
+    zipfile.crc32 = isal_zlib.crc32
+    return True
+
+
+def set_zip_compression(entry_info, filepath):
+    '''Applies the compression chosen by zip_compression_for to a ZipInfo.
+
+    ZipFile.open() takes the compression from the ZipInfo, not the archive. The
+    level is set through ZipInfo.compress_level, which is public from Python
+    3.13; older versions deflate at zlib's default level instead.
+    '''
+    entry_info.compress_type, compresslevel = zip_compression_for(filepath)
+    if hasattr(entry_info, 'compress_level'):
+        entry_info.compress_level = compresslevel
+    return entry_info
+
+
+def find_project_id(migrator, project_name):
+    '''Returns the ID of the named project on the source site, or None.
+
+    The name is matched exactly on the server with a REST filter, so only the
+    matching project is returned. The full project list is only paged through
+    (once per server/site) when that finds nothing, to allow case-insensitive
+    matches. Results are cached for later lookups.
+    '''
+    index = _project_indexes.setdefault((migrator.source_server_url, migrator.source_site), {})
+    key = project_name.lower()
+    if key in index:
+        return index[key]
+    TSC = _tsc()
+    req_option = TSC.RequestOptions()
+    req_option.filter.add(TSC.Filter(TSC.RequestOptions.Field.Name,
+                                     TSC.RequestOptions.Operator.Equals,
+                                     project_name))
+    projects, _ = migrator.source_server.projects.get(req_options=req_option)
+    if projects:
+        index[key] = projects[0].id
+        return index[key]
+    # Fall back to a case-insensitive match over every project
+    for p in migrator.list_projects(migrator.source_server):
+        # Keep the first project with a given name, as the old linear scan did
+        index.setdefault(p.name.lower(), p.id)
+    return index.get(key)
+
+
+def resolve_tableau_workbook(migrator, workbook_name, source_project_id_or_name):
+    '''Looks up one workbook by name within a project given by name or ID.'''
+    # Sign in once and reuse the session for every later workbook
+    if not migrator.source_server:
+        migrator.connect_to_source()
+    # If project argument is a UUID, use it as the ID, else treat it as a name
+    try:
+        uuid.UUID(source_project_id_or_name)
         project_id = source_project_id_or_name
-    else:
-        # Find by project name
-        projects = migrator.list_projects(migrator.source_server)
-        for p in projects:
-            if p.name.lower() == source_project_id_or_name.lower():
-                project_id = p.id
-                break
+    except ValueError:
+        project_id = find_project_id(migrator, source_project_id_or_name)
         if not project_id:
             raise Exception(f"Project '{source_project_id_or_name}' not found on Tableau server")
     # Find workbook by name
     workbook = migrator.find_workbook_by_name(migrator.source_server, workbook_name, project_id=project_id)
     if not workbook:
         raise Exception(f"Workbook '{workbook_name}' not found in project '{source_project_id_or_name}'")
-    # Download using existing logic, but publish to dummy target project to trigger just the download
-    logger.info(f"Downloading workbook '{workbook_name}' (ID: {workbook.id})...")
-    temp_project_id = project_id      # Not used as we don't migrate, just for context
-    # Migrate workbook logic downloads and uploads: but here we want just the download
-    # So extract code from migrate_workbook for download only
-    # First: try both twbx and twb
-    root_name = workbook.name
-    safe_filename = root_name.replace(' ', '_')
-    for ext in ['.twbx', '.twb']:
-        candidate = os.path.join(download_dir, safe_filename + ext)
-        try:
-            migrator.source_server.workbooks.download(workbook.id, candidate, include_extract=migrator.include_extract)
-            if os.path.exists(candidate) and os.path.getsize(candidate) > 0:
-                logger.info(f"Downloaded to: {candidate}")
-                return candidate
-        except Exception as e:
-            logger.debug(f"Failed to download as {ext}: {e}")
-    raise Exception("Unable to download workbook in either .twbx or .twb format.")
+    return workbook
+
+
+def download_tableau_workbook(migrator, workbook_name, source_project_id_or_name, download_dir):
+    '''Downloads one workbook by name from Tableau using TableauMigrator.'''
+    workbook = resolve_tableau_workbook(migrator, workbook_name, source_project_id_or_name)
+    logger.info("Downloading workbook '%s' (ID: %s)...", workbook_name, workbook.id)
+    # Given a path without an extension, TSC appends the one from the server's
+    # Content-Disposition header, so one request yields either .twbx or .twb
+    base_path = os.path.join(download_dir, workbook.name.replace(' ', '_'))
+    downloaded = migrator.source_server.workbooks.download(workbook.id, base_path,
+                                                           include_extract=migrator.include_extract)
+    if not os.path.exists(downloaded) or os.path.getsize(downloaded) == 0:
+        raise Exception(f"Unable to download workbook '{workbook_name}': {downloaded} is missing or empty.")
+    if workbook.updated_at:
+        # Stamp the file with the server's timestamp so zipping it is reproducible
+        updated = workbook.updated_at.timestamp()
+        os.utime(downloaded, (updated, updated))
+    logger.info("Downloaded to: %s", downloaded)
+    return downloaded
+
+
+def iter_workbook_content(migrator, workbook):
+    '''Yields a workbook's content from the Tableau REST API in CHUNK_SIZE pieces.'''
+    server = migrator.source_server
+    url = f"{server.workbooks.baseurl}/{workbook.id}/content"
+    if not migrator.include_extract:
+        url += "?includeExtract=False"
+    with http_session.get(url, headers={'X-Tableau-Auth': server.auth_token},
+                          stream=True, verify=migrator.verify_ssl) as response:
+        response.raise_for_status()
+        yield from response.iter_content(chunk_size=CHUNK_SIZE)
+
+
+def open_workbook_content(migrator, workbook, download_dir):
+    '''Starts streaming a workbook and picks its local file name from the first bytes.
+
+    Returns a ``(workbook_path, chunks)`` tuple, where ``chunks`` yields the whole
+    workbook content, including the bytes already peeked at.
+    '''
+    chunks = iter_workbook_content(migrator, workbook)
+    first_chunk = next(chunks, b'')
+    if not first_chunk:
+        raise Exception(f"Tableau returned an empty download for workbook '{workbook.name}'")
+    # Packaged workbooks are zip archives; plain workbooks are XML
+    ext = '.twbx' if first_chunk.startswith(ZIP_MAGIC) else '.twb'
+    local_file = os.path.join(download_dir, workbook.name.replace(' ', '_') + ext)
+    return local_file, itertools.chain([first_chunk], chunks)
+
+
+def write_workbook_and_zip(chunks, local_file, zip_target, updated_at=None):
+    '''Writes workbook chunks to ``local_file`` and, in the same pass, into a zip.
+
+    ``zip_target`` is a path or a writable file object; unseekable streams such as
+    pipes are fine, as zipfile then writes sizes after the data instead. The
+    workbook's SHA-256 is computed on the same pass, saved next to it as a
+    ``.sha256`` sidecar and returned as a hex string.
+
+    If ``chunks`` raises, a zip written to a path is deleted, so a partial
+    download never leaves a complete-looking archive behind. A zip written to a
+    stream is closed normally, so the caller has to abort whatever consumes it.
+    '''
+    # Date the entry with the workbook's last update, so an unchanged
+    # workbook always produces a byte-identical zip
+    entry_info = set_zip_compression(zipfile.ZipInfo(os.path.basename(local_file)), local_file)
+    if updated_at:
+        entry_info.date_time = updated_at.timetuple()[:6]
+    # Checked once up front: this loop runs per chunk
+    log_progress = logger.isEnabledFor(logging.DEBUG)
+    written = 0
+    digest = hashlib.sha256()
+    try:
+        with open(local_file, 'wb') as out, \
+                zipfile.ZipFile(zip_target, 'w', allowZip64=True) as zipf, \
+                zipf.open(entry_info, 'w', force_zip64=True) as entry:
+            for chunk in chunks:
+                out.write(chunk)
+                entry.write(chunk)
+                digest.update(chunk)
+                if log_progress:
+                    written += len(chunk)
+                    logger.debug("Wrote %d bytes of %s", written, local_file)
+    except BaseException:
+        if not hasattr(zip_target, 'write') and os.path.exists(zip_target):
+            os.remove(zip_target)
+        raise
+    sha256 = digest.hexdigest()
+    write_sha256_sidecar(local_file, sha256)
+    return sha256
+
+
+def write_sha256_sidecar(local_file, sha256):
+    '''Saves ``sha256`` as ``<local_file>.sha256`` in ``sha256sum`` format.
+
+    The sidecar is given the workbook's timestamps, so workbook_sha256 can tell
+    that it was written for this copy of the file.
+    '''
+    sidecar = local_file + '.sha256'
+    with open(sidecar, 'w') as f:
+        f.write(f"{sha256}  {os.path.basename(local_file)}\n")
+    st = os.stat(local_file)
+    os.utime(sidecar, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+
+def workbook_sha256(local_file):
+    '''Returns the workbook's SHA-256, reading its sidecar when one is present.
+
+    Workbooks fetched through the TSC fallback have no sidecar yet; those are
+    hashed once here and the sidecar is written for later steps. A sidecar only
+    counts when its mtime equals the workbook's: download_tableau_workbook
+    stamps a fresh download with the server's updated_at, which can be older
+    than a sidecar left by an earlier download.
+    '''
+    sidecar = local_file + '.sha256'
+    try:
+        fresh = os.stat(sidecar).st_mtime_ns == os.stat(local_file).st_mtime_ns
+    except FileNotFoundError:
+        fresh = False
+    if fresh:
+        with open(sidecar) as f:
+            return f.read().split()[0]
+    with open(local_file, 'rb') as f:
+        sha256 = hashlib.file_digest(f, 'sha256').hexdigest()
+    write_sha256_sidecar(local_file, sha256)
+    return sha256
+
+
+def stream_workbook_to_zip(migrator, workbook_name, source_project_id_or_name, download_dir):
+    '''Streams one workbook from Tableau into both a local file and its zip in a single pass.
+
+    Each chunk of the REST download is written to the workbook file and to the
+    zip entry as it arrives, so the workbook is never read back from disk to be
+    zipped. Returns a ``(workbook_path, zip_path)`` tuple.
+    '''
+    workbook = resolve_tableau_workbook(migrator, workbook_name, source_project_id_or_name)
+    logger.info("Streaming workbook '%s' (ID: %s)...", workbook_name, workbook.id)
+    local_file, chunks = open_workbook_content(migrator, workbook, download_dir)
+    zip_path = local_file + '.zip'
+    sha256 = write_workbook_and_zip(chunks, local_file, zip_path, workbook.updated_at)
+    logger.info("Downloaded to: %s (sha256 %s)", local_file, sha256)
+    logger.info("Zipped file at: %s", zip_path)
+    return local_file, zip_path
 
 
 def zip_file(input_filepath, zip_path=None):
     if not zip_path:
         zip_path = input_filepath + '.zip'
-    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        zipf.write(input_filepath, arcname=os.path.basename(input_filepath))
-    logger.info(f"Zipped file at: {zip_path}")
+    entry_info = zipfile.ZipInfo.from_file(input_filepath, arcname=os.path.basename(input_filepath))
+    set_zip_compression(entry_info, input_filepath)
+    with open(input_filepath, 'rb', buffering=UPLOAD_CHUNK_SIZE) as src, \
+            zipfile.ZipFile(zip_path, 'w', allowZip64=True) as zipf, \
+            zipf.open(entry_info, 'w') as entry:
+        if hasattr(os, 'posix_fadvise'):
+            # The file is read front to back once: ask the kernel for aggressive readahead
+            os.posix_fadvise(src.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        shutil.copyfileobj(src, entry, length=UPLOAD_CHUNK_SIZE)
+    logger.info("Zipped file at: %s", zip_path)
     return zip_path
 
 
+class FileChunks:
+    '''Iterates over an open file in large chunks and reports its total size.
+
+    Passing this as a request body makes requests send a fixed Content-Length
+    and write the file in ``chunk_size`` pieces instead of small socket blocks.
+    Every iteration starts from the beginning of the file, so a retried request
+    sends the full body again.
+    '''
+
+    def __init__(self, fileobj, size, chunk_size=UPLOAD_CHUNK_SIZE):
+        self.fileobj = fileobj
+        self.size = size
+        self.chunk_size = chunk_size
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        self.fileobj.seek(0)
+        return iter(lambda: self.fileobj.read(self.chunk_size), b'')
+
+
+def create_http_session():
+    '''Creates a keep-alive requests session that retries transient server errors.'''
+    session = requests.Session()
+    retry = Retry(total=MAX_RETRIES, backoff_factor=0.5, status_forcelist=list(RETRY_STATUSES))
+    adapter = HTTPAdapter(max_retries=retry)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers['Connection'] = 'keep-alive'
+    return session
+
+
+# Shared by all Nexus and Tableau REST calls so TCP/TLS connections are reused
+http_session = create_http_session()
+
+
+def file_checksums(path):
+    '''Returns the hex MD5, SHA-1 and SHA-256 digests of a file, keyed by algorithm.
+
+    All three are computed in a single read of the file.
+    '''
+    digests = {name: hashlib.new(name) for name in ('md5', 'sha1', 'sha256')}
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(UPLOAD_CHUNK_SIZE), b''):
+            for digest in digests.values():
+                digest.update(chunk)
+    return {name: digest.hexdigest() for name, digest in digests.items()}
+
+
+def nexus_has_artifact(upload_url, sha256, nexus_username, nexus_password):
+    '''Checks whether Nexus already stores an artifact with the given SHA-256.'''
+    try:
+        response = http_session.head(upload_url, auth=(nexus_username, nexus_password))
+    except requests.RequestException as e:
+        logger.debug("Nexus checksum lookup failed: %s", e)
+        return False
+    return response.status_code == 200 and response.headers.get('X-Checksum-Sha256', '').lower() == sha256
+
+
 def upload_to_nexus(zip_path, nexus_url, nexus_username, nexus_password):
     """Upload zip file to Nexus raw or Maven repo."""
     filename = os.path.basename(zip_path)
     upload_url = nexus_url.rstrip('/') + '/' + filename
-    logger.info(f"Uploading {filename} to Nexus at {upload_url}")
-    with open(zip_path, 'rb') as f:
-        response = requests.put(
-            upload_url,
-            auth=(nexus_username, nexus_password),
-            headers={'Content-Type': 'application/zip'},
-            data=f
+    checksums = file_checksums(zip_path)
+    if nexus_has_artifact(upload_url, checksums['sha256'], nexus_username, nexus_password):
+        logger.info("Nexus already has an identical %s; skipping upload.", filename)
+        return
+    logger.info("Uploading %s to Nexus at %s", filename, upload_url)
+    # Precomputed checksums let the repository verify the upload without hashing it again
+    headers = {
+        'Content-Type': 'application/zip',
+        'X-Checksum-Md5': checksums['md5'],
+        'X-Checksum-Sha1': checksums['sha1'],
+        'X-Checksum-Sha256': checksums['sha256'],
+    }
+    if can_sendfile(upload_url):
+        status_code, text = sendfile_upload(upload_url, zip_path, headers, nexus_username, nexus_password)
+    else:
+        status_code, text = session_put(upload_url, zip_path, headers, nexus_username, nexus_password)
+    check_nexus_response(status_code, text)
+
+
+def session_put(url, path, headers, username, password):
+    '''PUTs a file through http_session, returning a ``(status_code, response_text)`` tuple.'''
+    with open(path, 'rb') as f:
+        response = http_session.put(
+            url,
+            auth=(username, password),
+            headers=headers,
+            data=FileChunks(f, os.path.getsize(path))
         )
-    if response.status_code in (200, 201, 204):
+    return response.status_code, response.text
+
+
+def can_sendfile(url):
+    '''Tells whether a file can be PUT to ``url`` with os.sendfile.
+
+    Zero-copy sending needs a plain-HTTP socket: TLS encrypts in user space, and
+    a configured proxy has to go through requests. A NO_PROXY setting on its own
+    doesn't count as a proxy.
+    '''
+    if not hasattr(os, 'sendfile') or urllib.parse.urlsplit(url).scheme != 'http':
+        return False
+    proxies = requests.utils.get_environ_proxies(url)
+    return not (proxies.get('http') or proxies.get('all'))
+
+
+def sendfile_upload(url, path, headers, username, password):
+    '''PUTs a file with sendfile_put, retrying and following redirects as http_session would.
+
+    Connection errors and RETRY_STATUSES are retried up to MAX_RETRIES times with
+    the session's backoff. Redirects to the same host are followed; any other
+    redirect, which sendfile can't follow or shouldn't send the credentials to,
+    hands the whole upload to session_put. Returns a
+    ``(status_code, response_text)`` tuple.
+    '''
+    origin = urllib.parse.urlsplit(url)
+    target = url
+    attempt = redirects = 0
+    while True:
+        try:
+            status_code, text, location = sendfile_put(target, path, headers, username, password)
+        except (OSError, http.client.HTTPException) as e:
+            if attempt == MAX_RETRIES:
+                raise
+            logger.debug("sendfile upload to %s failed (%s); retrying", target, e)
+        else:
+            if status_code in REDIRECT_STATUSES and location and redirects < MAX_REDIRECTS:
+                target = urllib.parse.urljoin(target, location)
+                redirects += 1
+                parts = urllib.parse.urlsplit(target)
+                if not can_sendfile(target) or (parts.hostname, parts.port) != (origin.hostname, origin.port):
+                    return session_put(url, path, headers, username, password)
+                continue
+            if status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                return status_code, text
+        time.sleep(0.5 * 2 ** attempt)
+        attempt += 1
+
+
+def sendfile_put(url, path, headers, username, password):
+    '''PUTs a file over plain HTTP, copying it from the page cache straight to the socket.
+
+    Returns a ``(status_code, response_text, location)`` tuple, where
+    ``location`` is the Location header of a redirect, or None.
+    '''
+    parts = urllib.parse.urlsplit(url)
+    credentials = base64.b64encode(f'{username}:{password}'.encode()).decode('ascii')
+    conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=SENDFILE_TIMEOUT)
+    try:
+        conn.putrequest('PUT', parts.path + (f'?{parts.query}' if parts.query else ''))
+        conn.putheader('Authorization', f'Basic {credentials}')
+        conn.putheader('Content-Length', str(os.path.getsize(path)))
+        for name, value in headers.items():
+            conn.putheader(name, value)
+        conn.endheaders()
+        with open(path, 'rb') as f:
+            conn.sock.sendfile(f)
+        response = conn.getresponse()
+        return response.status, response.read().decode('utf-8', 'replace'), response.getheader('Location')
+    finally:
+        conn.close()
+
+
+def check_nexus_response(status_code, text):
+    '''Raises if a Nexus upload response is not a success.'''
+    if status_code in (200, 201, 204):
         logger.info("Upload to Nexus succeeded.")
     else:
-        logger.error(f"Nexus upload failed! Status {response.status_code}: {response.text}")
-        raise Exception(f"Nexus upload failed: {response.text}")
+        logger.error("Nexus upload failed! Status %s: %s", status_code, text)
+        raise Exception(f"Nexus upload failed: {text}")
+
+
+def stream_workbook_to_nexus(migrator, workbook_name, source_project_id_or_name, download_dir,
+                             nexus_url, nexus_username, nexus_password):
+    '''Streams one workbook from Tableau to Nexus as a zip, without the zip touching disk.
+
+    The download is zipped into one end of a pipe while a background thread
+    PUTs whatever arrives at the other end, using chunked transfer encoding.
+    The workbook itself is still saved locally for the GitHub push; its path
+    is returned.
+    '''
+    workbook = resolve_tableau_workbook(migrator, workbook_name, source_project_id_or_name)
+    logger.info("Streaming workbook '%s' (ID: %s) to Nexus...", workbook_name, workbook.id)
+    local_file, chunks = open_workbook_content(migrator, workbook, download_dir)
+    filename = os.path.basename(local_file) + '.zip'
+    upload_url = nexus_url.rstrip('/') + '/' + filename
+
+    read_fd, write_fd = os.pipe()
+    download_failed = threading.Event()
+    upload = {}
+
+    def pipe_body(pipe_in):
+        yield from iter(lambda: pipe_in.read(UPLOAD_CHUNK_SIZE), b'')
+        if download_failed.is_set():
+            # Dropping the connection before the final chunk keeps Nexus from
+            # storing a truncated zip
+            raise IOError("Workbook download failed; aborting Nexus upload")
+
+    def send():
+        with os.fdopen(read_fd, 'rb') as pipe_in:
+            try:
+                # Plain requests.put: the session's retries cannot replay a pipe
+                upload['response'] = requests.put(
+                    upload_url,
+                    auth=(nexus_username, nexus_password),
+                    headers={'Content-Type': 'application/zip'},
+                    data=pipe_body(pipe_in)
+                )
+            except Exception as e:
+                upload['error'] = e
+
+    logger.info("Uploading %s to Nexus at %s", filename, upload_url)
+    sender = threading.Thread(target=send, daemon=True)
+    sender.start()
+    try:
+        with os.fdopen(write_fd, 'wb') as pipe_out:
+            try:
+                write_workbook_and_zip(chunks, local_file, pipe_out, workbook.updated_at)
+            except BrokenPipeError:
+                raise
+            except Exception:
+                # The zip in the pipe was closed normally and so looks complete.
+                # Set before the pipe closes, so the sender sees it when it
+                # reaches EOF and drops the upload.
+                download_failed.set()
+                raise
+    except BrokenPipeError:
+        # The sender stopped reading; its own error is raised below
+        pass
+    finally:
+        sender.join()
+    if 'error' in upload:
+        raise upload['error']
+    check_nexus_response(upload['response'].status_code, upload['response'].text)
+    logger.info("Downloaded to: %s", local_file)
+    return local_file
+
+
+def github_retry_delay(error, attempt):
+    '''Returns the seconds to wait before retrying a failed GitHub call, or None to give up.
+
+    Primary and secondary rate limits honour Retry-After or X-RateLimit-Reset when
+    GitHub sends them and otherwise back off exponentially from one minute; 5xx
+    errors back off from two seconds. Anything else is not retried.
+    '''
+    headers = {k.lower(): v for k, v in (error.headers or {}).items()}
+    if error.status in (500, 502, 503, 504):
+        return 2 ** attempt
+    rate_limited = (isinstance(error, RateLimitExceededException) or error.status == 429
+                    or (error.status == 403 and 'rate limit' in str(error.data).lower()))
+    if not rate_limited:
+        return None
+    if 'retry-after' in headers:
+        return int(headers['retry-after'])
+    if headers.get('x-ratelimit-remaining') == '0' and 'x-ratelimit-reset' in headers:
+        return max(int(headers['x-ratelimit-reset']) - time.time(), 0) + 1
+    return 60 * 2 ** (attempt - 1)
+
+
+def github_call(func, *args, **kwargs):
+    '''Calls a PyGithub method, sleeping and retrying through rate limits and 5xx errors.'''
+    for attempt in range(1, GITHUB_MAX_ATTEMPTS + 1):
+        try:
+            return func(*args, **kwargs)
+        except GithubException as e:
+            delay = github_retry_delay(e, attempt)
+            if delay is None or attempt == GITHUB_MAX_ATTEMPTS:
+                raise
+            logger.warning("GitHub call %s failed with status %s; retrying in %.0fs (attempt %s/%s)",
+                           func.__name__, e.status, delay, attempt, GITHUB_MAX_ATTEMPTS)
+            time.sleep(delay)
 
 
 def push_to_github_and_pr(repo_name, token, local_file, base_branch='main'):
     g = Github(token)
-    repo = g.get_repo(repo_name)
-    # Create a branch off main
-    sb = repo.get_branch(base_branch)
-    from datetime import datetime
-    new_branch_name = f'tableau-wb-{Path(local_file).stem}-{datetime.utcnow().strftime("%Y%m%d%H%M%S")}'
-    repo.create_git_ref(ref=f'refs/heads/{new_branch_name}', sha=sb.commit.sha)
-    logger.info(f"Created branch {new_branch_name}")
-    # Add the file (commit)
-    with open(local_file, 'rb') as f:
-        content = f.read()
-    repo.create_or_update_file(
-        path=f"{os.path.basename(local_file)}",
-        message=f"Add Tableau workbook {os.path.basename(local_file)}",
-        content=content,
-        branch=new_branch_name
+    repo = github_call(g.get_repo, repo_name)
+    sb = github_call(repo.get_branch, base_branch)
+    sha256 = workbook_sha256(local_file)
+    # Upload the workbook as a git blob, then build a tree and commit on top of base.
+    # The file is memory-mapped so only the base64 text is held in memory.
+    with open(local_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        encoded = base64.b64encode(mm).decode('ascii')
+    blob = github_call(repo.create_git_blob, encoded, 'base64')
+    del encoded
+    base_commit = sb.commit.commit
+    tree = github_call(
+        repo.create_git_tree,
+        [InputGitTreeElement(path=os.path.basename(local_file), mode='100644', type='blob', sha=blob.sha)],
+        base_tree=base_commit.tree
     )
-    logger.info(f"Committed workbook to {new_branch_name}")
+    commit = github_call(repo.create_git_commit,
+                         f"Add Tableau workbook {os.path.basename(local_file)}\n\nSHA-256: {sha256}",
+                         tree, [base_commit])
+    # Create the branch pointing straight at the new commit. A nanosecond
+    # timestamp plus a random suffix keeps names unique across concurrent pushes.
+    new_branch_name = f'tableau-wb-{Path(local_file).stem}-{time.time_ns()}-{secrets.token_hex(3)}'
+    github_call(repo.create_git_ref, ref=f'refs/heads/{new_branch_name}', sha=commit.sha)
+    logger.info("Created branch %s", new_branch_name)
+    logger.info("Committed workbook to %s", new_branch_name)
     # Create PR
-    pr = repo.create_pull(
+    pr = github_call(
+        repo.create_pull,
         title=f"Add Tableau workbook {os.path.basename(local_file)}",
-        body=f"Automated Tableau workbook upload.",
+        body=f"Automated Tableau workbook upload.\n\nSHA-256: `{sha256}`",
         head=new_branch_name,
         base=base_branch
     )
-    logger.info(f"PR created: {pr.html_url}")
+    logger.info("PR created: %s", pr.html_url)
     return pr.html_url
 
 
+def download_and_zip(migrator, workbook_name, source_project, download_dir):
+    '''Downloads a workbook and zips it, returning ``(workbook_path, zip_path)``.'''
+    try:
+        return stream_workbook_to_zip(migrator, workbook_name, source_project, download_dir)
+    except requests.RequestException as e:
+        # Fall back to downloading through TSC and zipping afterwards
+        logger.warning("Streaming download failed (%s); falling back to download then zip", e)
+        local_workbook = download_tableau_workbook(migrator, workbook_name, source_project, download_dir)
+        return local_workbook, zip_file(local_workbook)
+
+
+# Marks the end of the work queue between pipeline stages
+_END_OF_QUEUE = object()
+
+
+def export_workbooks(migrator, workbook_names, source_project, download_dir, stream_to_nexus=False):
+    '''Exports several workbooks through a download -> Nexus -> GitHub pipeline.
+
+    Each stage runs in its own thread and hands work on through a small bounded
+    queue, so one workbook downloads while the previous ones are uploaded and
+    pushed, and at most a few downloaded workbooks wait on disk at a time.
+    GitHub pushes stay strictly one at a time to keep within its rate limits.
+    Returns a {workbook name: PR URL} dict; failed workbooks are logged and left out.
+    '''
+    to_nexus = queue.Queue(maxsize=2)
+    to_github = queue.Queue(maxsize=2)
+    pr_urls = {}
+
+    def nexus_stage():
+        for name, local_workbook, zip_path in iter(to_nexus.get, _END_OF_QUEUE):
+            try:
+                upload_to_nexus(zip_path, NEXUS_URL, NEXUS_USERNAME, NEXUS_PASSWORD)
+            except Exception as e:
+                logger.error("Nexus upload failed for workbook '%s': %s", name, e)
+                continue
+            to_github.put((name, local_workbook))
+        to_github.put(_END_OF_QUEUE)
+
+    def github_stage():
+        for name, local_workbook in iter(to_github.get, _END_OF_QUEUE):
+            try:
+                pr_urls[name] = push_to_github_and_pr(GITHUB_REPO, GITHUB_TOKEN, local_workbook)
+            except Exception as e:
+                logger.error("GitHub push failed for workbook '%s': %s", name, e)
+
+    stages = [threading.Thread(target=nexus_stage), threading.Thread(target=github_stage)]
+    for stage in stages:
+        stage.start()
+    try:
+        for name in workbook_names:
+            try:
+                if stream_to_nexus:
+                    local_workbook = stream_workbook_to_nexus(migrator, name, source_project, download_dir,
+                                                              NEXUS_URL, NEXUS_USERNAME, NEXUS_PASSWORD)
+                    to_github.put((name, local_workbook))
+                else:
+                    local_workbook, zip_path = download_and_zip(migrator, name, source_project, download_dir)
+                    to_nexus.put((name, local_workbook, zip_path))
+            except Exception as e:
+                logger.error("Download failed for workbook '%s': %s", name, e)
+    finally:
+        to_nexus.put(_END_OF_QUEUE)
+        for stage in stages:
+            stage.join()
+    return pr_urls
+
+
+def secure_download_root():
+    '''Checks that DOWNLOAD_ROOT is a real directory owned by this user and makes it private.
+
+    Another local user could create the root first, or replace it with a
+    symlink, to get at the workbooks downloaded into it; such a root is
+    refused with an exception. Raises FileNotFoundError if it doesn't exist.
+    '''
+    st = os.lstat(DOWNLOAD_ROOT)
+    if not stat.S_ISDIR(st.st_mode):
+        raise Exception(f"Download root {DOWNLOAD_ROOT} is not a directory; refusing to use it")
+    if hasattr(os, 'getuid'):
+        if st.st_uid != os.getuid():
+            raise Exception(f"Download root {DOWNLOAD_ROOT} is owned by another user; refusing to use it")
+        if stat.S_IMODE(st.st_mode) != 0o700:
+            os.chmod(DOWNLOAD_ROOT, 0o700)
+
+
+def make_download_dir():
+    '''Creates this run's download directory under DOWNLOAD_ROOT, stamped with the epoch.
+
+    The directory holds a DOWNLOAD_DIR_PID_FILE naming this process, so other
+    runs don't reap it while it is in use.
+    '''
+    try:
+        os.mkdir(DOWNLOAD_ROOT, 0o700)
+    except FileExistsError:
+        pass
+    secure_download_root()
+    download_dir = tempfile.mkdtemp(prefix=f'{int(time.time())}-', dir=DOWNLOAD_ROOT)
+    with open(os.path.join(download_dir, DOWNLOAD_DIR_PID_FILE), 'w') as f:
+        f.write(str(os.getpid()))
+    return download_dir
+
+
+def pid_running(pid):
+    '''Tells whether a process with this ID is running.
+
+    Only POSIX can check without side effects (signal 0); elsewhere the
+    process is assumed to be running.
+    '''
+    if os.name != 'posix':
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def download_dir_in_use(path):
+    '''Tells whether a download directory's pid file names a running process.'''
+    try:
+        with open(os.path.join(path, DOWNLOAD_DIR_PID_FILE)) as f:
+            return pid_running(int(f.read()))
+    except FileNotFoundError:
+        return False
+    except (OSError, ValueError):
+        # Unreadable or half-written: leave the directory alone
+        return True
+
+
+def reap_stale_download_dirs(max_age=STALE_DOWNLOAD_DIR_AGE, stop=None):
+    '''Deletes download directories left in DOWNLOAD_ROOT by earlier runs.
+
+    Directories still in use by a running process are skipped. Once ``stop``
+    (a threading.Event) is set, no further directories are started on.
+    '''
+    cutoff = time.time() - max_age
+    try:
+        secure_download_root()
+        entries = list(os.scandir(DOWNLOAD_ROOT))
+    except FileNotFoundError:
+        return
+    except Exception as e:
+        logger.warning("Not reaping stale download directories: %s", e)
+        return
+    for entry in entries:
+        if stop and stop.is_set():
+            return
+        try:
+            if (entry.is_dir(follow_symlinks=False) and entry.stat(follow_symlinks=False).st_mtime < cutoff
+                    and not download_dir_in_use(entry.path)):
+                shutil.rmtree(entry.path, ignore_errors=True)
+                logger.debug("Removed stale download directory: %s", entry.path)
+        except OSError as e:
+            logger.debug("Could not remove stale download directory %s: %s", entry.path, e)
+
+
 def main():
     import argparse
     parser = argparse.ArgumentParser(description="Automate Tableau workbook export to Nexus and GitHub.")
-    parser.add_argument('--workbook-name', required=True, help='Name of the Tableau workbook to download (case sensitive)')
+    workbooks = parser.add_mutually_exclusive_group(required=True)
+    workbooks.add_argument('--workbook-name', help='Name of the Tableau workbook to download (case sensitive)')
+    workbooks.add_argument('--workbook-names', nargs='+',
+                           help='Names of several workbooks to export in one run, pipelined over a single sign-in')
     parser.add_argument('--source-project', required=True, help='Source Tableau project name or ID (must be precise)')
     parser.add_argument('--download-dir', default=None, help='Optional directory for downloads')
+    parser.add_argument('--sync-cleanup', action='store_true',
+                        help='Delete the temporary download directory before exiting instead of leaving it '
+                             'for a later run to reap')
+    parser.add_argument('--stream-to-nexus', action='store_true',
+                        help='Zip the download straight into the Nexus upload without writing the zip to disk '
+                             '(skips the unchanged-artifact check)')
+    parser.add_argument('--isal', action='store_true',
+                        help='Compress and checksum zips with ISA-L (requires the isal package)')
     args = parser.parse_args()
 
     # Safety checks for env/config
@@ -159,8 +837,14 @@ def main():
         logger.error("Missing required environment/config variables. Please check .env file and usage comments.")
         sys.exit(1)
 
-    # Prepare download directory
-    download_dir = args.download_dir or tempfile.mkdtemp()
+    if args.isal and not use_isal_for_zip():
+        logger.warning("isal is not installed; zipping with zlib. Install with: pip install isal")
+
+    # Prepare download directory; old runs' directories are reaped in the background
+    reaper_stop = threading.Event()
+    reaper = threading.Thread(target=reap_stale_download_dirs, kwargs={'stop': reaper_stop}, daemon=True)
+    reaper.start()
+    download_dir = args.download_dir or make_download_dir()
 
     # Initialize TableauMigrator for source only
     migrator = TableauMigrator(
@@ -178,19 +862,46 @@ def main():
         download_dir=download_dir
     )
     try:
-        # 1. Download workbook
-        local_workbook = download_tableau_workbook(migrator, args.workbook_name, args.source_project, download_dir)
-        # 2. Zip the file
-        zip_path = zip_file(local_workbook)
-        # 3. Upload zip to Nexus
-        upload_to_nexus(zip_path, NEXUS_URL, NEXUS_USERNAME, NEXUS_PASSWORD)
-        # 4. Push workbook file to GitHub & create PR
-        pr_url = push_to_github_and_pr(GITHUB_REPO, GITHUB_TOKEN, local_workbook)
-        logger.info(f"SUCCESS: GitHub PR created at {pr_url}")
+        if args.workbook_names:
+            pr_urls = export_workbooks(migrator, args.workbook_names, args.source_project, download_dir,
+                                       stream_to_nexus=args.stream_to_nexus)
+            for name, pr_url in pr_urls.items():
+                logger.info("SUCCESS: GitHub PR for '%s' created at %s", name, pr_url)
+            failed = [name for name in args.workbook_names if name not in pr_urls]
+            if failed:
+                logger.error("Failed to export %s workbook(s): %s", len(failed), ', '.join(failed))
+                sys.exit(1)
+        else:
+            if args.stream_to_nexus:
+                # 1-3. Download, zip and upload to Nexus in a single stream
+                local_workbook = stream_workbook_to_nexus(migrator, args.workbook_name, args.source_project, download_dir,
+                                                          NEXUS_URL, NEXUS_USERNAME, NEXUS_PASSWORD)
+                # 4. Push workbook file to GitHub & create PR
+                pr_url = push_to_github_and_pr(GITHUB_REPO, GITHUB_TOKEN, local_workbook)
+            else:
+                # 1-2. Download workbook and zip it on the fly
+                local_workbook, zip_path = download_and_zip(migrator, args.workbook_name, args.source_project, download_dir)
+                # 3. Upload zip to Nexus and 4. push workbook file to GitHub & create PR.
+                # The two talk to independent services, so they run side by side.
+                with ThreadPoolExecutor(max_workers=2) as executor:
+                    nexus_upload = executor.submit(upload_to_nexus, zip_path, NEXUS_URL, NEXUS_USERNAME, NEXUS_PASSWORD)
+                    github_push = executor.submit(push_to_github_and_pr, GITHUB_REPO, GITHUB_TOKEN, local_workbook)
+                    nexus_upload.result()
+                    pr_url = github_push.result()
+            logger.info("SUCCESS: GitHub PR created at %s", pr_url)
     finally:
         if not args.download_dir and os.path.isdir(download_dir):
-            import shutil
-            shutil.rmtree(download_dir)
+            if args.sync_cleanup:
+                shutil.rmtree(download_dir)
+            else:
+                # Leave the directory for a later run to reap
+                try:
+                    os.remove(os.path.join(download_dir, DOWNLOAD_DIR_PID_FILE))
+                except FileNotFoundError:
+                    pass
+        # Let the reaper finish the directory it is removing rather than die part way through
+        reaper_stop.set()
+        reaper.join(REAPER_JOIN_TIMEOUT)
 
 if __name__ == "__main__":
     main()
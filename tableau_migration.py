@@ -12,17 +12,321 @@ import argparse
 import getpass
 import logging
 import tempfile
-import tableauserverclient as TSC
+import shutil
+import traceback
 from pathlib import Path
+import json
+import hashlib
+import string
 import time
-import re
+import uuid
+import queue
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import quoteattr
+import threading
+import itertools
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-# Add dotenv support for reading environment variables
-try:
-    from dotenv import load_dotenv
-    DOTENV_AVAILABLE = True
-except ImportError:
-    DOTENV_AVAILABLE = False
+# tableauserverclient pulls in requests and its XML/packaging dependencies, so it is
+# imported by _tsc() on the first connect rather than here; --help and argument
+# errors then exit without loading it
+TSC = None
+
+
+def _tsc():
+    """Import tableauserverclient on first use and bind it to the module-level TSC name"""
+    global TSC
+    if TSC is None:
+        import tableauserverclient
+        TSC = tableauserverclient
+    return TSC
+
+
+def _is_connection_error(error):
+    """Whether ``error`` is a requests error raised before or instead of an HTTP response
+    
+    requests' exceptions derive from IOError and carry the request; those without
+    a response are dropped or broken connections, which are worth retrying. HTTP
+    error statuses and local errors such as a full disk are not.
+    """
+    return hasattr(error, 'request') and getattr(error, 'response', None) is None
+
+
+# Chunk size for streaming workbook downloads to disk
+DOWNLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+# Times a broken workbook download is resumed before giving up
+DOWNLOAD_RETRIES = 3
+# Workbooks smaller than this are always downloaded over a single connection
+SEGMENTED_DOWNLOAD_MIN_SIZE = 64 * 1024 * 1024
+# Largest page size the REST API accepts; TSC's Pager defaults to 100
+PAGE_SIZE = 1000
+# Packaged workbooks (.twbx) are zip archives
+ZIP_MAGIC = b'PK\x03\x04'
+# Tableau accepts workbooks up to 64 MB in a single publish request; larger
+# ones go through a file upload session in UPLOAD_CHUNK_SIZE parts
+SINGLE_PUBLISH_LIMIT = 64 * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 50 * 1024 * 1024
+# str.translate table that replaces ASCII characters unsafe in file names with '_'
+_SAFE_FILENAME_CHARS = set(string.ascii_letters + string.digits + '-_.')
+_SAFE_FILENAME_TABLE = {i: (chr(i) if chr(i) in _SAFE_FILENAME_CHARS else '_') for i in range(128)}
+
+
+# --verbosity choices and the logging levels they set
+LEVELS = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+}
+
+
+def _setup_logger(level=logging.INFO):
+    """Return the tableau_migrator logger at ``level``, adding its stderr handler only once"""
+    logger = logging.getLogger('tableau_migrator')
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+        logger.addHandler(handler)
+    logger.setLevel(level)
+    return logger
+
+
+class _StreamingMultipart:
+    """multipart/mixed request body for Tableau publish calls that streams its file part
+    
+    requests takes the Content-Length from __len__ and pulls the body through
+    __iter__, so the file part is read from disk in DOWNLOAD_CHUNK_SIZE pieces
+    instead of being held in memory.
+    """
+    
+    def __init__(self, payload, file_part=None):
+        # file_part is (part name, file name, path, offset, length)
+        boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/mixed; boundary={boundary}"
+        self.file_part = file_part
+        self.head = (f'--{boundary}\r\nContent-Disposition: form-data; name="request_payload"\r\n'
+                     f'Content-Type: text/xml\r\n\r\n').encode() + payload + b'\r\n'
+        if file_part:
+            name, filename = file_part[:2]
+            self.head += (f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+                          f'Content-Type: application/octet-stream\r\n\r\n').encode()
+            self.tail = f'\r\n--{boundary}--\r\n'.encode()
+        else:
+            self.tail = f'--{boundary}--\r\n'.encode()
+    
+    def __len__(self):
+        return len(self.head) + (self.file_part[4] if self.file_part else 0) + len(self.tail)
+    
+    def __iter__(self):
+        yield self.head
+        if self.file_part:
+            _, _, path, offset, remaining = self.file_part
+            with open(path, 'rb') as f:
+                f.seek(offset)
+                while remaining > 0:
+                    chunk = f.read(min(DOWNLOAD_CHUNK_SIZE, remaining))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+                    yield chunk
+        yield self.tail
+
+
+def _publish_requests(server, workbook_name, project_id, workbook_file, overwrite):
+    """Generate the REST requests that publish a workbook file to ``server``
+    
+    Yields (method, URL, body) tuples, where body is a _StreamingMultipart or
+    None. The caller sends each request with its own HTTP client and passes the
+    response body back in with send(). Workbooks of SINGLE_PUBLISH_LIMIT or more
+    go through a file upload session in UPLOAD_CHUNK_SIZE parts first.
+    """
+    workbook_type = os.path.splitext(workbook_file)[1].lstrip('.')
+    url = f"{server.workbooks.baseurl}?workbookType={workbook_type}"
+    if overwrite:
+        url += "&overwrite=true"
+    payload = (f"<tsRequest><workbook name={quoteattr(workbook_name)}>"
+               f"<project id={quoteattr(project_id)} /></workbook></tsRequest>").encode()
+    
+    file_size = os.path.getsize(workbook_file)
+    if file_size < SINGLE_PUBLISH_LIMIT:
+        yield 'POST', url, _StreamingMultipart(payload, ('tableau_workbook', os.path.basename(workbook_file),
+                                                         workbook_file, 0, file_size))
+        return
+    
+    upload_url = server.fileuploads.baseurl
+    content = yield 'POST', upload_url, None
+    upload_session_id = ET.fromstring(content).find('.//{*}fileUpload').get('uploadSessionId')
+    for offset in range(0, file_size, UPLOAD_CHUNK_SIZE):
+        length = min(UPLOAD_CHUNK_SIZE, file_size - offset)
+        yield 'PUT', f"{upload_url}/{upload_session_id}", _StreamingMultipart(
+            b'', ('tableau_file', 'file', workbook_file, offset, length))
+    yield 'POST', f"{url}&uploadSessionId={upload_session_id}", _StreamingMultipart(payload)
+
+
+def _load_json(path):
+    """Read a JSON file written by _save_json, or return {} if it is missing or unreadable"""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_json(path, data):
+    """Write ``data`` to a JSON file, replacing any earlier version atomically
+    
+    The data is written to a uniquely named temporary file in the same directory
+    and renamed over ``path``, so neither readers nor concurrent runs ever see a
+    partial file. Missing directories are created; both they and the file are
+    only accessible to their owner.
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + '.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+class _TokenCache:
+    """Sign-in tokens kept between runs in ~/.tableau_migrator/tokens.json
+    
+    Entries are keyed by server URL, site and token name or username, and keep
+    the REST API version the sign-in negotiated. The file is only readable by
+    its owner, since the tokens grant API access.
+    """
+    # Kept well under Tableau's default 240 minute session timeout
+    LIFETIME = 2 * 60 * 60
+    
+    def __init__(self, path=None):
+        self.path = path or os.path.join(Path.home(), '.tableau_migrator', 'tokens.json')
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _key(server_url, site, identity):
+        return f"{server_url}|{site}|{identity}"
+    
+    def get(self, server_url, site, identity):
+        """Return the cached entry for this sign-in, or None if missing or expired"""
+        entry = _load_json(self.path).get(self._key(server_url, site, identity))
+        if entry and entry.get('expires_at', 0) > time.time():
+            return entry
+        return None
+    
+    def put(self, server_url, site, identity, server):
+        """Cache the current sign-in of ``server``, dropping expired entries"""
+        now = time.time()
+        with self._lock:
+            entries = {key: entry for key, entry in _load_json(self.path).items()
+                       if entry.get('expires_at', 0) > now}
+            entries[self._key(server_url, site, identity)] = {
+                'auth_token': server.auth_token,
+                'site_id': server.site_id,
+                'user_id': server.user_id,
+                'site_url': getattr(server, '_site_url', None),
+                'version': server.version,
+                'expires_at': now + self.LIFETIME,
+            }
+            _save_json(self.path, entries)
+    
+    def invalidate(self, server_url, site, identity):
+        with self._lock:
+            entries = _load_json(self.path)
+            if entries.pop(self._key(server_url, site, identity), None):
+                _save_json(self.path, entries)
+
+
+class _PublishedWorkbooks:
+    """Workbooks published by earlier runs, kept in ~/.tableau_migrator/published.json
+    
+    Entries are keyed by source server URL, target server URL, target site and
+    source workbook ID. They hold the target project, the source workbook's
+    updated_at, the SHA-256 of the file that was published and the ID and
+    updated_at of the copy the publish created, so unchanged workbooks can be
+    skipped while that copy is intact. The file is only read once a migration
+    looks a workbook up, and new entries are only written to it by flush().
+    """
+    
+    def __init__(self, path=None):
+        self.path = path or os.path.join(Path.home(), '.tableau_migrator', 'published.json')
+        self._lock = threading.Lock()
+        self._entries = None
+        self._dirty = False
+    
+    @staticmethod
+    def _key(source_url, target_url, site_id, workbook_id):
+        return f"{source_url}|{target_url}|{site_id}|{workbook_id}"
+    
+    def _loaded(self):
+        # Callers hold self._lock
+        if self._entries is None:
+            self._entries = _load_json(self.path)
+        return self._entries
+    
+    def get(self, source_url, target_url, site_id, workbook_id):
+        with self._lock:
+            return self._loaded().get(self._key(source_url, target_url, site_id, workbook_id))
+    
+    def put(self, source_url, target_url, site_id, workbook, project_id, sha256, target_workbook):
+        with self._lock:
+            entries = self._loaded()
+            entries[self._key(source_url, target_url, site_id, workbook.id)] = {
+                'project_id': project_id,
+                'updated_at': str(workbook.updated_at),
+                'sha256': sha256,
+                'target_workbook_id': target_workbook.id if target_workbook else None,
+                'target_updated_at': str(target_workbook.updated_at) if target_workbook else None,
+            }
+            self._dirty = True
+    
+    def flush(self):
+        """Save the entries put since the last flush, if there are any"""
+        with self._lock:
+            if self._dirty:
+                _save_json(self.path, self._entries)
+                self._dirty = False
+
+
+class _Manifest:
+    """Workbooks already downloaded to a --download-dir, recorded in its .manifest.json
+    
+    Maps each workbook ID to the file it was saved as, with the workbook's
+    updated_at, size and SHA-256, so an unchanged workbook isn't fetched again.
+    """
+    
+    def __init__(self, directory):
+        self.directory = directory
+        self.path = os.path.join(directory, '.manifest.json')
+        self._lock = threading.Lock()
+        self._entries = _load_json(self.path)
+    
+    def get(self, workbook_id, updated_at):
+        """Return the path of the saved copy of a workbook, if it is still current"""
+        entry = self._entries.get(workbook_id)
+        if not entry or entry.get('updated_at') != str(updated_at):
+            return None
+        workbook_file = os.path.join(self.directory, entry['file'])
+        try:
+            if os.path.getsize(workbook_file) != entry.get('size'):
+                return None
+        except OSError:
+            return None
+        return workbook_file
+    
+    def put(self, workbook_id, updated_at, workbook_file, sha256):
+        with self._lock:
+            self._entries[workbook_id] = {
+                'updated_at': str(updated_at),
+                'file': os.path.basename(workbook_file),
+                'size': os.path.getsize(workbook_file),
+                'sha256': sha256,
+            }
+            _save_json(self.path, self._entries)
 
 
 class TableauMigrator:
@@ -32,7 +336,9 @@ class TableauMigrator:
                  source_username=None, source_password=None, 
                  target_username=None, target_password=None,
                  verify_ssl=True, api_version=None, download_dir=None, 
-                 include_extract=False, skip_data_sources=False):
+                 include_extract=False, skip_data_sources=False, max_workers=8,
+                 cache_tokens=False, keep_files=False, disk_budget=None, download_segments=1,
+                 skip_unchanged=False, force=False, dry_run=False):
         
         self.source_server_url = source_server
         self.target_server_url = target_server
@@ -41,6 +347,8 @@ class TableauMigrator:
         self.api_version = api_version
         self.include_extract = include_extract
         self.skip_data_sources = skip_data_sources
+        self.max_workers = max_workers
+        self.token_cache = _TokenCache() if cache_tokens else None
         
         # Authentication info
         self.source_token_name = source_token_name
@@ -59,38 +367,192 @@ class TableauMigrator:
             urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
             logger.warning("SSL certificate verification is disabled. This is insecure.")
         
-        # Server connections
-        self.source_server = None
-        self.target_server = None
+        # Server connections. Worker threads in migrate_project use their own
+        # copies of these, kept in self._local (see _clone_server)
+        self._source_server = None
+        self._target_server = None
+        self._local = threading.local()
+        
+        # Target projects keyed by (name, parent ID), filled by
+        # _prime_target_projects, and full project lists per (server, site)
+        # with an index of them by lowercase name
+        self._target_project_cache = None
+        self._site_project_lists = {}
+        self._site_project_names = {}
+        # Workbook listings per (server, site, project ID), see list_workbooks,
+        # and an index of each by lowercase name
+        self._workbook_lists = {}
+        self._workbook_names = {}
+        self._cache_lock = threading.Lock()
         
         # Set up logging
-        if logger:
-            self.logger = logger
-        else:
-            self.logger = logging.getLogger('tableau_migrator')
-            handler = logging.StreamHandler()
-            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-            handler.setFormatter(formatter)
-            self.logger.addHandler(handler)
-            self.logger.setLevel(logging.INFO)
+        self.logger = logger or _setup_logger()
         
         # Set up temp directory
         if download_dir:
             self.temp_dir = download_dir
             if not os.path.exists(self.temp_dir):
                 os.makedirs(self.temp_dir)
-                self.logger.info(f"Created download directory: {self.temp_dir}")
+                self.logger.info("Created download directory: %s", self.temp_dir)
             else:
-                self.logger.info(f"Using existing download directory: {self.temp_dir}")
+                self.logger.info("Using existing download directory: %s", self.temp_dir)
             self.should_delete_temp_dir = False
         else:
             self.temp_dir = tempfile.mkdtemp()
-            self.logger.info(f"Created temporary directory: {self.temp_dir}")
+            self.logger.info("Created temporary directory: %s", self.temp_dir)
             self.should_delete_temp_dir = True
+        
+        # Each workbook is deleted once published, unless --keep-files asks to keep
+        # them in the download directory. Kept downloads outlive the run, so they
+        # are recorded for reuse next time.
+        self.keep_downloaded_files = bool(download_dir) and keep_files
+        self._manifest = _Manifest(self.temp_dir) if self.keep_downloaded_files else None
+        
+        # Bytes of downloaded workbooks waiting to be published and deleted, which
+        # new downloads wait on while they exceed disk_budget
+        self.disk_budget = disk_budget
+        self._pending_files = {}
+        self._disk_space_freed = threading.Condition()
+        
+        # Parallel range requests used to download a single large workbook
+        self.download_segments = download_segments
+        
+        # With skip_unchanged, publishes are recorded and workbooks unchanged since
+        # an earlier run published them are skipped unless force is set. dry_run
+        # only reports what would be migrated.
+        self.force = force
+        self.dry_run = dry_run
+        self._published = _PublishedWorkbooks() if skip_unchanged else None
+        # SHA-256 of downloaded files, computed while streaming, for _file_sha256
+        self._file_digests = {}
 
+    @property
+    def source_server(self):
+        """Source server connection for the current thread"""
+        return getattr(self._local, 'source_server', None) or self._source_server
+    
+    @source_server.setter
+    def source_server(self, server):
+        self._source_server = server
+    
+    @property
+    def target_server(self):
+        """Target server connection for the current thread"""
+        return getattr(self._local, 'target_server', None) or self._target_server
+    
+    @target_server.setter
+    def target_server(self, server):
+        self._target_server = server
+    
+    def _clone_server(self, server):
+        """Create a Server that reuses the sign-in of ``server`` with its own HTTP session
+        
+        requests sessions are not guaranteed to be thread-safe, and signing in again
+        with the same personal access token would end the original session.
+        """
+        clone = TSC.Server(server.server_address, http_options=server.http_options)
+        clone.version = server.version
+        self._tune_session(clone)
+        clone._set_auth(server.site_id, server.user_id, server.auth_token,
+                        getattr(server, '_site_url', None))
+        return clone
+    
+    def _tune_session(self, server):
+        """Size the HTTP connection pool of ``server`` for max_workers and retry transient errors
+        
+        Every request on the server then reuses pooled keep-alive connections, and
+        reads (GET and HEAD) that hit rate limiting (429, honouring Retry-After) or
+        a server or gateway error are retried with backoff. Writes are never
+        replayed, since a failed publish or upload-session PUT may already have
+        been applied. Once retries run out the last response is returned, so TSC
+        still raises its own ServerResponseError.
+        
+        TSC keeps its requests session in a private attribute, so this does nothing
+        on versions that don't have one. TSC only replaces the session on sign-out.
+        """
+        session = getattr(server, '_session', None)
+        if session is None:
+            return
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers * 2,
+                              max_retries=Retry(total=3, backoff_factor=0.3,
+                                                status_forcelist=[429, 500, 502, 503, 504],
+                                                allowed_methods=frozenset(['GET', 'HEAD']),
+                                                raise_on_status=False))
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers['Connection'] = 'keep-alive'
+    
+    def _resume_session(self, server, server_url, site, identity):
+        """Sign ``server`` in with a cached token from an earlier run, if it is still valid"""
+        if not self.token_cache or not identity:
+            return False
+        entry = self.token_cache.get(server_url, site, identity)
+        if not entry:
+            return False
+        
+        server._set_auth(entry['site_id'], entry['user_id'], entry['auth_token'], entry.get('site_url'))
+        # sign_in is what switches TSC from its default API version to the
+        # server's, so without an --api-version the version is restored here
+        if self.api_version is None:
+            if entry.get('version'):
+                server.version = entry['version']
+            else:
+                server.use_server_version()
+        try:
+            # Any authenticated request will do; a single project is the cheapest
+            server.projects.get(TSC.RequestOptions(pagesize=1))
+        except Exception as e:
+            self.logger.info("Cached sign-in for %s is no longer valid: %s", server_url, e)
+            self.token_cache.invalidate(server_url, site, identity)
+            server._clear_auth()
+            self._tune_session(server)
+            return False
+        
+        # Refresh the expiry, as Tableau's session timeout counts from the last request
+        self.token_cache.put(server_url, site, identity, server)
+        return True
+    
+    def _remember_session(self, server, server_url, site, identity):
+        """Cache the sign-in of ``server`` for later runs"""
+        if not self.token_cache or not identity:
+            return
+        try:
+            self.token_cache.put(server_url, site, identity, server)
+        except Exception as e:
+            self.logger.warning("Could not cache sign-in token: %s", e)
+    
+    def _switch_site(self, server, site):
+        """Switch ``server`` to a site (ID or content URL), unless it is already signed in to it"""
+        if site in (server.site_id, getattr(server, '_site_url', None)):
+            return
+        self.logger.info("Switching from site %s to %s", server.site_id, site)
+        server.auth.switch_site(TSC.SiteItem(name=site, content_url=site))
+    
     def connect_to_source(self):
         """Connect to the source Tableau server"""
-        self.logger.info(f"Connecting to source server: {self.source_server_url}, site: {self.source_site}")
+        self.logger.info("Connecting to source server: %s, site: %s", self.source_server_url, self.source_site)
+        
+        # Use auto-detect if no version is specified
+        use_server_version = True if self.api_version is None else False
+        
+        _tsc()
+        self.source_server = TSC.Server(self.source_server_url, use_server_version=use_server_version, 
+                                       http_options={"verify": self.verify_ssl})
+        
+        # Set API version if specified
+        if self.api_version:
+            self.source_server.version = self.api_version
+            self.logger.info("Using API version: %s", self.api_version)
+        
+        self._tune_session(self.source_server)
+        
+        # Reuse the sign-in from an earlier run while it is still valid
+        identity = self.source_token_name or self.source_username
+        if self._resume_session(self.source_server, self.source_server_url, self.source_site, identity):
+            self.logger.info("Reusing cached sign-in for source server")
+            return self.source_server
         
         if self.source_token_name and self.source_token_value:
             auth = TSC.PersonalAccessTokenAuth(
@@ -98,32 +560,42 @@ class TableauMigrator:
                 personal_access_token=self.source_token_value,
                 site_id=self.source_site
             )
-            self.logger.info(f"Using token authentication for source server")
+            self.logger.info("Using token authentication for source server")
         elif self.source_username:
             password = self.source_password or getpass.getpass("Source Server Password: ")
             auth = TSC.TableauAuth(self.source_username, password, site_id=self.source_site)
-            self.logger.info(f"Using username/password authentication for source server")
+            self.logger.info("Using username/password authentication for source server")
         else:
             raise ValueError("No authentication credentials provided for source server")
         
+        self.source_server.auth.sign_in(auth)
+        self._remember_session(self.source_server, self.source_server_url, self.source_site, identity)
+        self.logger.info("Successfully connected to source server")
+        return self.source_server
+
+    def connect_to_target(self):
+        """Connect to the target Tableau server"""
+        self.logger.info("Connecting to target server: %s, site: %s", self.target_server_url, self.target_site)
+        
         # Use auto-detect if no version is specified
         use_server_version = True if self.api_version is None else False
         
-        self.source_server = TSC.Server(self.source_server_url, use_server_version=use_server_version, 
+        _tsc()
+        self.target_server = TSC.Server(self.target_server_url, use_server_version=use_server_version, 
                                        http_options={"verify": self.verify_ssl})
         
         # Set API version if specified
         if self.api_version:
-            self.source_server.version = self.api_version
-            self.logger.info(f"Using API version: {self.api_version}")
+            self.target_server.version = self.api_version
+            self.logger.info("Using API version: %s", self.api_version)
         
-        self.source_server.auth.sign_in(auth)
-        self.logger.info(f"Successfully connected to source server")
-        return self.source_server
-
-    def connect_to_target(self):
-        """Connect to the target Tableau server"""
-        self.logger.info(f"Connecting to target server: {self.target_server_url}, site: {self.target_site}")
+        self._tune_session(self.target_server)
+        
+        # Reuse the sign-in from an earlier run while it is still valid
+        identity = self.target_token_name or self.target_username
+        if self._resume_session(self.target_server, self.target_server_url, self.target_site, identity):
+            self.logger.info("Reusing cached sign-in for target server")
+            return self.target_server
         
         if self.target_token_name and self.target_token_value:
             auth = TSC.PersonalAccessTokenAuth(
@@ -131,314 +603,846 @@ class TableauMigrator:
                 personal_access_token=self.target_token_value,
                 site_id=self.target_site
             )
-            self.logger.info(f"Using token authentication for target server")
+            self.logger.info("Using token authentication for target server")
         elif self.target_username:
             password = self.target_password or getpass.getpass("Target Server Password: ")
             auth = TSC.TableauAuth(self.target_username, password, site_id=self.target_site)
-            self.logger.info(f"Using username/password authentication for target server")
+            self.logger.info("Using username/password authentication for target server")
         else:
             raise ValueError("No authentication credentials provided for target server")
         
-        # Use auto-detect if no version is specified
-        use_server_version = True if self.api_version is None else False
-        
-        self.target_server = TSC.Server(self.target_server_url, use_server_version=use_server_version,
-                                       http_options={"verify": self.verify_ssl})
-        
-        # Set API version if specified
-        if self.api_version:
-            self.target_server.version = self.api_version
-            self.logger.info(f"Using API version: {self.api_version}")
-        
         self.target_server.auth.sign_in(auth)
-        self.logger.info(f"Successfully connected to target server")
+        self._remember_session(self.target_server, self.target_server_url, self.target_site, identity)
+        self.logger.info("Successfully connected to target server")
         return self.target_server
 
+    def _big_page(self):
+        """Request options that fetch PAGE_SIZE items per page, for use with TSC.Pager"""
+        return TSC.RequestOptions(pagesize=PAGE_SIZE)
+    
+    def _prompts_for_password(self, side):
+        """Whether signing in to the 'source' or 'target' server will prompt for a password"""
+        return bool(getattr(self, f"{side}_username") and not getattr(self, f"{side}_password")
+                    and not (getattr(self, f"{side}_token_name") and getattr(self, f"{side}_token_value")))
+    
+    def connect(self):
+        """Connect to the source and target servers, signing in to both at once
+        
+        Servers that are already connected are left as they are. A password
+        prompt would interleave with the other sign-in, so when one is needed
+        the servers are connected one after the other.
+        """
+        connects = []
+        if not self.source_server:
+            connects.append(self.connect_to_source)
+        if not self.target_server:
+            connects.append(self.connect_to_target)
+        
+        if len(connects) < 2 or self._prompts_for_password('source') or self._prompts_for_password('target'):
+            for connect in connects:
+                connect()
+            return
+        
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            for future in [executor.submit(connect) for connect in connects]:
+                future.result()
+    
     def list_source_sites(self):
         """List all sites on the source server"""
         if not self.source_server:
             self.connect_to_source()
         
-        all_sites = list(TSC.Pager(self.source_server.sites))
-        self.logger.info(f"Found {len(all_sites)} sites on source server")
+        all_sites = list(TSC.Pager(self.source_server.sites, self._big_page()))
+        self.logger.info("Found %s sites on source server", len(all_sites))
         return all_sites
     
     def list_projects(self, server, site=None):
         """List all projects on a server/site"""
-        if site and server.site_id != site:
+        if site:
             # Switch to the specified site if needed
-            current_site = server.site_id
-            self.logger.info(f"Switching from site {current_site} to {site}")
-            server.auth.switch_site(site)
+            self._switch_site(server, site)
         
-        all_projects = list(TSC.Pager(server.projects))
-        self.logger.info(f"Found {len(all_projects)} projects on site {server.site_id}")
+        all_projects = list(TSC.Pager(server.projects, self._big_page()))
+        self.logger.info("Found %s projects on site %s", len(all_projects), server.site_id)
         return all_projects
     
     def list_workbooks(self, server, site=None, project_id=None):
-        """List all workbooks on a server/site, optionally filtered by project"""
-        if site and server.site_id != site:
+        """List all workbooks on a server/site, optionally filtered by project
+        
+        Listings are cached per site and project until invalidate_workbooks is
+        called for that site, so looking a workbook up and then migrating it
+        pages through the workbooks once.
+        """
+        if site:
             # Switch to the specified site if needed
-            current_site = server.site_id
-            self.logger.info(f"Switching from site {current_site} to {site}")
-            server.auth.switch_site(site)
+            self._switch_site(server, site)
+        
+        key = (server.server_address, server.site_id, str(project_id).lower() if project_id else None)
+        workbooks = self._workbook_lists.get(key)
+        if workbooks is not None:
+            self.logger.info("Using %s cached workbooks from site %s", len(workbooks), server.site_id)
+            return workbooks
         
         try:
-            # Get all workbooks without any options that could trigger API compatibility issues
-            all_workbooks = []
-            for wb in TSC.Pager(server.workbooks):
-                all_workbooks.append(wb)
-            
-            self.logger.info(f"Retrieved {len(all_workbooks)} total workbooks from site {server.site_id}")
-            
-            # Filter locally by project_id if needed
-            if project_id:
-                # Debug info: Log all project IDs to help troubleshoot
-                if self.logger.level <= logging.DEBUG:
-                    project_ids = set(wb.project_id for wb in all_workbooks)
-                    self.logger.debug(f"Available project IDs in workbooks: {project_ids}")
-                    self.logger.debug(f"Looking for project ID: {project_id}")
-                
-                # More flexible comparison - convert both to strings for comparison
-                filtered_workbooks = [wb for wb in all_workbooks 
-                                     if str(wb.project_id).lower() == str(project_id).lower()]
-                
-                self.logger.info(f"Filtered to {len(filtered_workbooks)} workbooks in project {project_id}")
-                return filtered_workbooks
-            else:
-                return all_workbooks
-                
+            workbooks = self._fetch_workbooks(server, project_id)
         except Exception as e:
-            self.logger.error(f"Error listing workbooks: {str(e)}")
+            self.logger.error("Error listing workbooks: %s", e)
             return []
+        with self._cache_lock:
+            self._workbook_lists[key] = workbooks
+        return workbooks
+    
+    def invalidate_workbooks(self, server):
+        """Drop the cached workbook listings of the current site of ``server`` after a change"""
+        with self._cache_lock:
+            for key in [k for k in self._workbook_lists if k[:2] == (server.server_address, server.site_id)]:
+                del self._workbook_lists[key]
+                self._workbook_names.pop(key, None)
+    
+    def _get_workbooks_by_name(self, server, workbook_name, project_id=None):
+        """Workbooks listed by list_workbooks that are named ``workbook_name``, ignoring case"""
+        workbooks = self.list_workbooks(server, project_id=project_id)
+        key = (server.server_address, server.site_id, str(project_id).lower() if project_id else None)
+        names = self._workbook_names.get(key)
+        if names is None:
+            names = defaultdict(list)
+            for workbook in workbooks:
+                names[workbook.name.lower()].append(workbook)
+            # Failed listings aren't cached, so neither is an index of them
+            if key in self._workbook_lists:
+                with self._cache_lock:
+                    self._workbook_names[key] = names
+        return names.get(workbook_name.lower(), [])
+    
+    def _fetch_workbooks(self, server, project_id=None):
+        """Page through the workbooks on the current site of ``server``, optionally filtered by project"""
+        if project_id:
+            # Let the server filter by project first, so only that project's workbooks are sent
+            target_project_id = str(project_id).lower()
+            try:
+                req_option = self._big_page()
+                req_option.filter.add(TSC.Filter(TSC.RequestOptions.Field.ProjectId, 
+                                                  TSC.RequestOptions.Operator.Equals, 
+                                                  target_project_id))
+                filtered_workbooks = [wb for wb in TSC.Pager(server.workbooks, req_option)
+                                      if wb.project_id == target_project_id]
+                self.logger.info("Retrieved %s workbooks in project %s from site %s", len(filtered_workbooks), project_id, server.site_id)
+                return filtered_workbooks
+            except Exception as filter_err:
+                self.logger.info("Server-side project filter failed, filtering locally instead: %s", filter_err)
+        
+        # Get all workbooks without any options that could trigger API compatibility issues
+        workbooks = TSC.Pager(server.workbooks, self._big_page())
+        
+        if not project_id:
+            all_workbooks = list(workbooks)
+            self.logger.info("Retrieved %s total workbooks from site %s", len(all_workbooks), server.site_id)
+            return all_workbooks
+        
+        # Filter locally by project_id while paging. Tableau IDs are lowercase,
+        # so only the ID we're looking for needs normalising.
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+        project_ids = set()
+        filtered_workbooks = []
+        total = 0
+        for wb in workbooks:
+            total += 1
+            if debug:
+                project_ids.add(wb.project_id)
+            if wb.project_id == target_project_id:
+                filtered_workbooks.append(wb)
+        
+        self.logger.info("Retrieved %s total workbooks from site %s", total, server.site_id)
+        
+        # Debug info: Log all project IDs to help troubleshoot
+        if debug:
+            self.logger.debug("Available project IDs in workbooks: %s", project_ids)
+            self.logger.debug("Looking for project ID: %s", project_id)
+        
+        self.logger.info("Filtered to %s workbooks in project %s", len(filtered_workbooks), project_id)
+        return filtered_workbooks
+    
+    def _site_projects(self, server):
+        """All projects on the current site of ``server``, fetched once per site"""
+        key = (server.server_address, server.site_id)
+        projects = self._site_project_lists.get(key)
+        if projects is None:
+            projects = list(TSC.Pager(server.projects, self._big_page()))
+            with self._cache_lock:
+                self._site_project_lists[key] = projects
+        return projects
+    
+    def _get_projects_by_name(self, server, project_name):
+        """Projects on the current site of ``server`` named ``project_name``, ignoring case
+        
+        Until the site's projects have been listed, the server is asked for just
+        this name; the full listing is only paged when that finds nothing, since
+        the server's match is case sensitive.
+        """
+        key = (server.server_address, server.site_id)
+        names = self._site_project_names.get(key)
+        if names is None and key not in self._site_project_lists:
+            try:
+                req_option = self._big_page()
+                req_option.filter.add(TSC.Filter(TSC.RequestOptions.Field.Name,
+                                                  TSC.RequestOptions.Operator.Equals,
+                                                  project_name))
+                matching_projects = list(TSC.Pager(server.projects, req_option))
+                if matching_projects:
+                    return matching_projects
+            except Exception as filter_err:
+                self.logger.info("Server-side name filter failed, listing all projects instead: %s", filter_err)
+        if names is None:
+            names = defaultdict(list)
+            for project in self._site_projects(server):
+                names[project.name.lower()].append(project)
+            with self._cache_lock:
+                self._site_project_names[key] = names
+        return names.get(project_name.lower(), [])
+    
+    def _prime_target_projects(self):
+        """Fetch every project on the target site once, so ensure_project_exists can look them up locally"""
+        projects = list(TSC.Pager(self.target_server.projects, self._big_page()))
+        with self._cache_lock:
+            self._target_project_cache = {(p.name, p.parent_id): p for p in projects}
+        self.logger.info("Cached %s projects on target site %s", len(projects), self.target_server.site_id)
     
     def ensure_project_exists(self, project_name, parent_id=None):
-        """Make sure a project exists on the target server, create if it doesn't"""
+        """Make sure a project exists on the target server, create if it doesn't
+        
+        The name is matched exactly, as the server's name filter does, whether or
+        not the target projects have been cached. In a dry run a missing project
+        is not created, and None is returned.
+        """
+        if self._target_project_cache is not None:
+            return self._ensure_cached_project_exists(project_name, parent_id)
+        
         # Check if project exists
-        req_option = TSC.RequestOptions()
+        req_option = self._big_page()
         req_option.filter.add(TSC.Filter(TSC.RequestOptions.Field.Name, 
                                           TSC.RequestOptions.Operator.Equals, 
                                           project_name))
         
-        matching_projects = list(TSC.Pager(self.target_server.projects, req_option))
-        
-        if matching_projects:
-            for project in matching_projects:
-                # If parent_id is None, we're looking for top-level project
-                # If parent_id is not None, we need to match it
-                if (parent_id is None and project.parent_id is None) or \
-                   (parent_id is not None and project.parent_id == parent_id):
-                    self.logger.info(f"Found existing project: {project_name}")
-                    return project
+        # Pager fetches lazily, so this stops at the first page with a match
+        for project in TSC.Pager(self.target_server.projects, req_option):
+            # If parent_id is None, we're looking for top-level project
+            # If parent_id is not None, we need to match it
+            if (parent_id is None and project.parent_id is None) or \
+               (parent_id is not None and project.parent_id == parent_id):
+                self.logger.info("Found existing project: %s", project_name)
+                return project
         
         # Create the project if it doesn't exist
+        if self.dry_run:
+            self.logger.info("[dry run] Would create project: %s", project_name)
+            return None
         new_project = TSC.ProjectItem(name=project_name, parent_id=parent_id)
         new_project = self.target_server.projects.create(new_project)
-        self.logger.info(f"Created new project: {project_name}")
+        self.logger.info("Created new project: %s", project_name)
+        self._forget_site_projects(self.target_server)
         return new_project
     
-    def migrate_workbook(self, workbook_id, source_project, target_project_id):
+    def _ensure_cached_project_exists(self, project_name, parent_id):
+        """ensure_project_exists, looking the project up in the primed target project cache"""
+        key = (project_name, parent_id)
+        project = self._target_project_cache.get(key)
+        if project:
+            self.logger.info("Found existing project: %s", project_name)
+            return project
+        if self.dry_run:
+            self.logger.info("[dry run] Would create project: %s", project_name)
+            return None
+        
+        try:
+            new_project = self.target_server.projects.create(TSC.ProjectItem(name=project_name, parent_id=parent_id))
+        except Exception:
+            with self._cache_lock:
+                self._target_project_cache.pop(key, None)
+            raise
+        with self._cache_lock:
+            self._target_project_cache[key] = new_project
+        self.logger.info("Created new project: %s", project_name)
+        self._forget_site_projects(self.target_server)
+        return new_project
+    
+    def _forget_site_projects(self, server):
+        """Drop the cached project list of the current site of ``server`` after a change"""
+        with self._cache_lock:
+            self._site_project_lists.pop((server.server_address, server.site_id), None)
+            self._site_project_names.pop((server.server_address, server.site_id), None)
+    
+    def migrate_workbook(self, workbook_id, source_project, target_project_id, workbook=None):
         """Migrate a single workbook from source to target
         
         This is a copy operation - workbooks are copied to the target server
         but remain intact on the source server.
         """
-        if not self.source_server:
-            self.connect_to_source()
-        if not self.target_server:
-            self.connect_to_target()
+        if not self.source_server or not self.target_server:
+            self.connect()
+        
+        if workbook is None:
+            workbook = self._get_source_workbook(workbook_id, source_project)
+        if not self._changed_workbooks([workbook], target_project_id):
+            return
         
-        # First verify the workbook exists
         try:
-            # Check if workbook exists before attempting download
-            self.logger.info(f"Verifying workbook exists with ID: {workbook_id}")
-            try:
-                workbook = self.source_server.workbooks.get_by_id(workbook_id)
-                self.logger.info(f"Found workbook: {workbook.name} (ID: {workbook_id})")
-            except Exception as wb_err:
-                self.logger.error(f"Error finding workbook with ID {workbook_id}: {str(wb_err)}")
-                
-                # Try to list workbooks in the project to suggest valid IDs
+            self._copy_workbook(workbook, source_project, target_project_id)
+        finally:
+            self._finish_batch()
+    
+    def _copy_workbook(self, workbook, source_project, target_project_id):
+        """Download a workbook from the source and publish it to a target project"""
+        workbook_file = None
+        try:
+            workbook, workbook_file = self._download_workbook(workbook.id, source_project, workbook)
+            self._publish_workbook(workbook, workbook_file, target_project_id)
+        except Exception as e:
+            self.logger.error("Migration failed: %s", e)
+            raise
+        finally:
+            self._remove_temp_file(workbook_file)
+    
+    def _get_source_workbook(self, workbook_id, source_project):
+        """Fetch a workbook from the source server by ID, listing the project's workbooks if it isn't found"""
+        # Check if workbook exists before attempting download
+        self.logger.info("Verifying workbook exists with ID: %s", workbook_id)
+        try:
+            workbook = self.source_server.workbooks.get_by_id(workbook_id)
+            self.logger.info("Found workbook: %s (ID: %s)", workbook.name, workbook_id)
+        except Exception as wb_err:
+            self.logger.error("Error finding workbook with ID %s: %s", workbook_id, wb_err)
+            
+            # Try to list workbooks in the project to suggest valid IDs. The
+            # suggestions are info messages, so skip the listing when they'd be dropped.
+            if self.logger.isEnabledFor(logging.INFO):
                 try:
                     project_workbooks = self.list_workbooks(self.source_server, project_id=source_project)
                     if project_workbooks:
                         self.logger.info("Available workbooks in this project:")
                         for wb in project_workbooks:
-                            self.logger.info(f"  - {wb.name} (ID: {wb.id})")
+                            self.logger.info("  - %s (ID: %s)", wb.name, wb.id)
                     else:
-                        self.logger.info(f"No workbooks found in project ID: {source_project}")
+                        self.logger.info("No workbooks found in project ID: %s", source_project)
                 except Exception as list_err:
-                    self.logger.error(f"Error listing workbooks: {str(list_err)}")
-                
-                raise ValueError(f"Workbook with ID '{workbook_id}' not found. Please verify the ID is correct.")
-            
-            # Create safe filenames without characters that might cause issues
-            safe_filename = re.sub(r'[^\w\-_.]', '_', f"workbook_{workbook_id}")
+                    self.logger.error("Error listing workbooks: %s", list_err)
             
-            # Try two different file extensions
-            file_extensions = ['.twbx', '.twb']
-            downloaded = False
-            workbook_file = None
-            error_messages = []
+            raise ValueError(f"Workbook with ID '{workbook_id}' not found. Please verify the ID is correct.")
+        
+        return workbook
+    
+    def _download_workbook(self, workbook_id, source_project, workbook=None):
+        """Download a workbook from the source server
+        
+        ``workbook`` is the WorkbookItem when the caller already has it from a
+        listing; otherwise it is fetched by ID. Returns a ``(workbook, workbook_file)`` tuple.
+        """
+        if workbook is None:
+            workbook = self._get_source_workbook(workbook_id, source_project)
+        
+        # Reuse the copy from an earlier run if the workbook hasn't changed since
+        if self._manifest:
+            cached_file = self._manifest.get(workbook_id, workbook.updated_at)
+            if cached_file:
+                self.logger.info("Workbook %s is unchanged since it was downloaded to %s", workbook.name, cached_file)
+                return workbook, cached_file
+        
+        # Create safe filenames without characters that might cause issues
+        safe_filename = f"workbook_{workbook_id}".translate(_SAFE_FILENAME_TABLE)
+        
+        self._wait_for_disk_budget()
+        
+        # Try two different file extensions
+        file_extensions = ['.twbx', '.twb']
+        downloaded = False
+        workbook_file = None
+        error_messages = []
+        
+        # Stream the content straight to disk first; the TSC downloads below are fallbacks
+        streamed = False
+        sha256 = None
+        try:
+            workbook_file, sha256 = self._stream_download(workbook_id, safe_filename)
+            downloaded = streamed = True
+            self.logger.info("Successfully downloaded workbook to %s", workbook_file)
+        except Exception as stream_err:
+            error_messages.append(f"Error during streaming download: {str(stream_err)}")
+        
+        for ext in file_extensions:
+            if downloaded:
+                break
+                
+            workbook_file = os.path.join(self.temp_dir, f"{safe_filename}{ext}")
+            self.logger.info("Attempting to download workbook %s to %s", workbook_id, workbook_file)
             
-            for ext in file_extensions:
-                if downloaded:
-                    break
-                    
-                workbook_file = os.path.join(self.temp_dir, f"{safe_filename}{ext}")
-                self.logger.info(f"Attempting to download workbook {workbook_id} to {workbook_file}")
+            try:
+                # Specify include_extract based on user option
+                self.source_server.workbooks.download(workbook_id, workbook_file, include_extract=self.include_extract)
                 
-                try:
-                    # Specify include_extract based on user option
-                    self.source_server.workbooks.download(workbook_id, workbook_file, include_extract=self.include_extract)
+                # Verify file was downloaded and exists
+                if os.path.exists(workbook_file):
+                    file_size = os.path.getsize(workbook_file)
+                    self.logger.info("Downloaded workbook file size: %s bytes", file_size)
                     
-                    # Verify file was downloaded and exists
-                    if os.path.exists(workbook_file):
-                        file_size = os.path.getsize(workbook_file)
-                        self.logger.info(f"Downloaded workbook file size: {file_size} bytes")
-                        
-                        if file_size > 0:
-                            downloaded = True
-                            self.logger.info(f"Successfully downloaded workbook to {workbook_file}")
-                        else:
-                            os.remove(workbook_file)
-                            error_messages.append(f"Downloaded file is empty (extension: {ext})")
+                    if file_size > 0:
+                        downloaded = True
+                        self.logger.info("Successfully downloaded workbook to %s", workbook_file)
                     else:
-                        error_messages.append(f"File does not exist after download (extension: {ext})")
-                except Exception as download_err:
-                    error_messages.append(f"Error during download with extension {ext}: {str(download_err)}")
-            
-            # If no successful download, try a fallback approach
-            if not downloaded:
+                        os.remove(workbook_file)
+                        error_messages.append(f"Downloaded file is empty (extension: {ext})")
+                else:
+                    error_messages.append(f"File does not exist after download (extension: {ext})")
+            except Exception as download_err:
+                error_messages.append(f"Error during download with extension {ext}: {str(download_err)}")
+        
+        # If no successful download, try a fallback approach
+        if not downloaded:
+            try:
+                self.logger.info("Trying alternative download approach...")
+                # Create a simpler path with a basic file name
+                workbook_file = os.path.join(self.temp_dir, "workbook.twbx")
+                
+                # Try a different API approach - note: no_extract was incorrect
+                # The correct parameter is include_extract
+                self.logger.info("Downloading to directory %s with include_extract=%s", self.temp_dir, self.include_extract)
+                # Snapshot the directory so only files the download adds need inspecting
+                names_before = {entry.name for entry in os.scandir(self.temp_dir)}
                 try:
-                    self.logger.info("Trying alternative download approach...")
-                    # Create a simpler path with a basic file name
-                    workbook_file = os.path.join(self.temp_dir, "workbook.twbx")
-                    
-                    # Try a different API approach - note: no_extract was incorrect
-                    # The correct parameter is include_extract
-                    self.logger.info(f"Downloading to directory {self.temp_dir} with include_extract={self.include_extract}")
-                    try:
-                        download_path = self.source_server.workbooks.download(workbook_id, 
-                                                                            filepath=self.temp_dir, 
-                                                                            include_extract=self.include_extract)
-                        self.logger.info(f"Download path returned: {download_path}")
-                    except TypeError:
-                        # Older versions of TSC might not support the include_extract parameter
-                        self.logger.info("Trying download without extra parameters")
-                        download_path = self.source_server.workbooks.download(workbook_id, 
-                                                                            filepath=self.temp_dir)
-                    
-                    # Handle the case where the path is returned as a string
-                    if isinstance(download_path, str) and os.path.exists(download_path):
-                        workbook_file = download_path
-                        file_size = os.path.getsize(workbook_file)
-                        self.logger.info(f"Alternative download succeeded with path return. File: {workbook_file}, size: {file_size} bytes")
+                    download_path = self.source_server.workbooks.download(workbook_id, 
+                                                                        filepath=self.temp_dir, 
+                                                                        include_extract=self.include_extract)
+                    self.logger.info("Download path returned: %s", download_path)
+                except TypeError:
+                    # Older versions of TSC might not support the include_extract parameter
+                    self.logger.info("Trying download without extra parameters")
+                    download_path = self.source_server.workbooks.download(workbook_id, 
+                                                                        filepath=self.temp_dir)
+                
+                # Handle the case where the path is returned as a string
+                if isinstance(download_path, str) and os.path.exists(download_path):
+                    workbook_file = download_path
+                    file_size = os.path.getsize(workbook_file)
+                    self.logger.info("Alternative download succeeded with path return. File: %s, size: %s bytes", workbook_file, file_size)
+                    downloaded = True
+                # Or the case where the download method returns None but creates the file
+                elif download_path is None:
+                    # Look for any new files in the temp dir that might be our workbook.
+                    # If the download overwrote an existing file, nothing is new, so
+                    # consider every workbook file instead.
+                    possible_files = [entry for entry in os.scandir(self.temp_dir)
+                                      if entry.name.endswith(('.twb', '.twbx'))]
+                    new_files = [entry for entry in possible_files if entry.name not in names_before]
+                    if possible_files:
+                        # DirEntry.stat() is cached, so each candidate is stat'ed once
+                        newest_file = max(new_files or possible_files, key=lambda entry: entry.stat().st_ctime_ns)
+                        workbook_file = newest_file.path
+                        file_size = newest_file.stat().st_size
+                        self.logger.info("Found potential workbook file: %s, size: %s bytes", workbook_file, file_size)
                         downloaded = True
-                    # Or the case where the download method returns None but creates the file
-                    elif download_path is None:
-                        # Look for any new files in the temp dir that might be our workbook
-                        possible_files = [f for f in os.listdir(self.temp_dir) 
-                                        if f.endswith('.twb') or f.endswith('.twbx')]
-                        if possible_files:
-                            newest_file = max(possible_files, key=lambda f: os.path.getctime(os.path.join(self.temp_dir, f)))
-                            workbook_file = os.path.join(self.temp_dir, newest_file)
-                            if os.path.exists(workbook_file):
-                                file_size = os.path.getsize(workbook_file)
-                                self.logger.info(f"Found potential workbook file: {workbook_file}, size: {file_size} bytes")
-                                downloaded = True
-                        else:
-                            error_messages.append("No workbook files found in download directory")
                     else:
-                        error_messages.append("Alternative download approach returned a path, but file does not exist")
-                except Exception as alt_err:
-                    error_messages.append(f"Alternative download approach failed: {str(alt_err)}")
-                    self.logger.error(f"Exception details: {alt_err.__class__.__name__}: {str(alt_err)}")
-                    import traceback
-                    self.logger.error(f"Traceback: {traceback.format_exc()}")
-            
-            # If still not downloaded, raise error with all the messages
-            if not downloaded:
-                error_detail = "\n".join(error_messages)
-                self.logger.error(f"All download attempts failed:\n{error_detail}")
-                raise FileNotFoundError(f"Failed to download workbook {workbook_id} after multiple attempts")
+                        error_messages.append("No workbook files found in download directory")
+                else:
+                    error_messages.append("Alternative download approach returned a path, but file does not exist")
+            except Exception as alt_err:
+                error_messages.append(f"Alternative download approach failed: {str(alt_err)}")
+                self.logger.error("Exception details: %s: %s", alt_err.__class__.__name__, alt_err)
+                self.logger.error("Traceback: %s", traceback.format_exc())
+        
+        # If still not downloaded, raise error with all the messages
+        if not downloaded:
+            error_detail = "\n".join(error_messages)
+            self.logger.error("All download attempts failed:\n%s", error_detail)
+            raise FileNotFoundError(f"Failed to download workbook {workbook_id} after multiple attempts")
+        
+        # The streaming download syncs its own file; TSC's downloads are synced here
+        # so the file is fully on disk before it is published
+        if not streamed:
+            try:
+                with open(workbook_file, 'rb+') as downloaded_file:
+                    os.fsync(downloaded_file.fileno())
+            except OSError as sync_err:
+                self.logger.warning("Could not sync %s to disk: %s", workbook_file, sync_err)
+        
+        self._track_pending_file(workbook_file)
+        
+        if self._manifest:
+            sha256 = self._file_sha256(workbook_file, sha256)
+            self._manifest.put(workbook_id, workbook.updated_at, workbook_file, sha256)
+        if sha256:
+            self._file_digests[workbook_file] = sha256
+        
+        return workbook, workbook_file
+    
+    def _file_sha256(self, workbook_file, sha256=None):
+        """SHA-256 of a downloaded workbook, reusing the digest taken while it was streamed"""
+        sha256 = sha256 or self._file_digests.get(workbook_file)
+        if sha256 is None:
+            with open(workbook_file, 'rb') as f:
+                sha256 = hashlib.file_digest(f, 'sha256').hexdigest()
+        return sha256
+    
+    def _changed_workbooks(self, workbooks, target_project_id):
+        """The workbooks whose updated_at differs from when they were last published to the target project
+        
+        Unchanged workbooks are logged and left out when skip_unchanged is on and
+        force is not. In a dry run the workbooks that would be migrated are logged
+        and none are returned.
+        """
+        changed = []
+        for workbook in workbooks:
+            entry = self._published_entry(workbook)
+            if (not self.force and entry and entry['project_id'] == target_project_id
+                    and entry['updated_at'] == str(workbook.updated_at)
+                    and self._target_copy(workbook, entry, target_project_id)):
+                self.logger.info("Skipping workbook %s: unchanged since it was last migrated, according to %s "
+                                 "(use --force to migrate it anyway)", workbook.name, self._published.path)
+            elif self.dry_run:
+                self.logger.info("[dry run] Would migrate workbook %s (%s)", workbook.name,
+                                 "changed" if entry else "new")
+            else:
+                changed.append(workbook)
+        return changed
+    
+    def _content_unchanged(self, workbook, target_project_id, sha256):
+        """Whether the target project already has this exact workbook content from an earlier run
+        
+        Records the workbook's new updated_at when it does, so later runs skip it
+        without downloading it.
+        """
+        entry = self._published_entry(workbook)
+        if self.force or not entry or entry['project_id'] != target_project_id or entry['sha256'] != sha256:
+            return False
+        target_workbook = self._target_copy(workbook, entry, target_project_id)
+        if not target_workbook:
+            return False
+        self.logger.info("Skipping publish of workbook %s: its content is unchanged since it was last migrated, "
+                         "according to %s", workbook.name, self._published.path)
+        self._record_published(workbook, target_project_id, sha256, target_workbook)
+        return True
+    
+    def _target_copy(self, workbook, entry, target_project_id):
+        """The copy of a workbook that an earlier run published, if it is still on the target unchanged
+        
+        Returns None when the copy has since been deleted, renamed or updated on
+        the target, so the workbook is migrated again. Looks in the cached
+        listing of the target project.
+        """
+        for target_workbook in self._get_workbooks_by_name(self.target_server, workbook.name, target_project_id):
+            if (target_workbook.id == entry.get('target_workbook_id')
+                    and str(target_workbook.updated_at) == entry.get('target_updated_at')):
+                return target_workbook
+        return None
+    
+    def _published_entry(self, workbook):
+        if not self._published:
+            return None
+        return self._published.get(self.source_server_url, self.target_server_url,
+                                   self.target_server.site_id, workbook.id)
+    
+    def _record_published(self, workbook, target_project_id, sha256, target_workbook):
+        """Record a workbook as published, along with the copy on the target it created"""
+        if self._published:
+            self._published.put(self.source_server_url, self.target_server_url, self.target_server.site_id,
+                                workbook, target_project_id, sha256, target_workbook)
+    
+    def _finish_batch(self):
+        """Refresh the target workbook listings and save the publishes recorded since the last batch
+        
+        Done once per migrated project or workbook rather than per publish, so
+        parallel uploads don't take turns rewriting published.json.
+        """
+        self.invalidate_workbooks(self.target_server)
+        if self._published:
+            self._published.flush()
+    
+    def _published_item(self, content):
+        """The WorkbookItem in the body of a publish response, or None if it has none"""
+        try:
+            return TSC.WorkbookItem.from_response(content, self.target_server.namespace)[0]
+        except (ET.ParseError, IndexError):
+            return None
+    
+    def _stream_download(self, workbook_id, safe_filename):
+        """Download a workbook's content to the temp directory in large chunks
+        
+        TSC's own download writes 1 KB at a time; this reads the same REST endpoint
+        in DOWNLOAD_CHUNK_SIZE chunks into a .part file, which is renamed to the
+        workbook's file name once complete. If the connection breaks part way
+        through, the download is resumed with a Range request from the bytes
+        already on disk. Returns the path of the downloaded file and its SHA-256.
+        """
+        server = self.source_server
+        url = f"{server.workbooks.baseurl}/{workbook_id}/content"
+        if not self.include_extract:
+            url += "?includeExtract=False"
+        headers = {'X-Tableau-Auth': server.auth_token}
+        
+        if self.download_segments > 1:
+            result = self._segmented_download(url, headers, workbook_id, safe_filename)
+            if result:
+                return result
+        
+        # The workbook is written under a .part name and renamed once complete, so a
+        # file with the workbook's name is never a partial download
+        part_file = os.path.join(self.temp_dir, f"{safe_filename}.part")
+        workbook_file = None
+        digest = hashlib.sha256()
+        written = 0
+        resumable = False
+        try:
+            for attempt in range(DOWNLOAD_RETRIES + 1):
+                request_headers = dict(headers)
+                if written:
+                    request_headers['Range'] = f"bytes={written}-"
+                try:
+                    with server.session.get(url, headers=request_headers, stream=True,
+                                            **server.http_options) as response:
+                        response.raise_for_status()
+                        if written and response.status_code != 206:
+                            # The server sent the whole workbook again instead of the range
+                            written = 0
+                            digest = hashlib.sha256()
+                        resumable = response.headers.get('Accept-Ranges') == 'bytes'
+                        chunks = response.iter_content(DOWNLOAD_CHUNK_SIZE)
+                        
+                        if workbook_file is None:
+                            first_chunk = next(chunks, b'')
+                            if not first_chunk:
+                                raise IOError(f"Empty download for workbook {workbook_id}")
+                            ext = '.twbx' if first_chunk.startswith(ZIP_MAGIC) else '.twb'
+                            workbook_file = os.path.join(self.temp_dir, f"{safe_filename}{ext}")
+                            self.logger.info("Streaming workbook %s to %s", workbook_id, workbook_file)
+                            chunks = itertools.chain([first_chunk], chunks)
+                        
+                        with open(part_file, 'r+b' if written else 'wb') as f:
+                            f.seek(written)
+                            for chunk in chunks:
+                                f.write(chunk)
+                                digest.update(chunk)
+                                written += len(chunk)
+                            f.truncate()
+                            # Sync while the file is still open rather than reopening it afterwards
+                            f.flush()
+                            os.fsync(f.fileno())
+                    os.replace(part_file, workbook_file)
+                    return workbook_file, digest.hexdigest()
+                except OSError as e:
+                    if not _is_connection_error(e) or attempt == DOWNLOAD_RETRIES:
+                        raise
+                    if not resumable:
+                        written = 0
+                        digest = hashlib.sha256()
+                    self.logger.warning("Download of workbook %s broke off (%s); retrying from byte %s",
+                                        workbook_id, e, written)
+        except BaseException:
+            if os.path.exists(part_file):
+                os.remove(part_file)
+            raise
+    
+    def _segmented_download(self, url, headers, workbook_id, safe_filename):
+        """Download a large workbook over download_segments parallel range requests
+        
+        Each segment is written in place with os.pwrite. Returns None, so the caller
+        falls back to a single stream, when the workbook is too small, the server
+        does not accept ranges or the platform has no pwrite.
+        """
+        if not hasattr(os, 'pwrite'):
+            return None
+        server = self.source_server
+        head = server.session.head(url, headers=headers, **server.http_options)
+        size = int(head.headers.get('Content-Length') or 0)
+        if (head.status_code != 200 or head.headers.get('Accept-Ranges') != 'bytes'
+                or size < SEGMENTED_DOWNLOAD_MIN_SIZE):
+            return None
+        
+        part_file = os.path.join(self.temp_dir, f"{safe_filename}.part")
+        segment_size = -(-size // self.download_segments)
+        self.logger.info("Downloading workbook %s (%s bytes) in %s segments",
+                         workbook_id, size, self.download_segments)
+        
+        def fetch(fd, start, end):
+            # Resume a broken segment from the last byte written, like _stream_download
+            for attempt in range(DOWNLOAD_RETRIES + 1):
+                try:
+                    with server.session.get(url, headers={**headers, 'Range': f"bytes={start}-{end}"},
+                                            stream=True, **server.http_options) as response:
+                        response.raise_for_status()
+                        if response.status_code != 206:
+                            raise IOError(f"Server ignored the range request for workbook {workbook_id}")
+                        for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                            os.pwrite(fd, chunk, start)
+                            start += len(chunk)
+                    if start <= end:
+                        raise IOError(f"Segment of workbook {workbook_id} ended {end + 1 - start} bytes early")
+                    return
+                except OSError as e:
+                    if not _is_connection_error(e) or attempt == DOWNLOAD_RETRIES:
+                        raise
+        
+        fd = os.open(part_file, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.ftruncate(fd, size)
+            with ThreadPoolExecutor(max_workers=self.download_segments) as executor:
+                futures = [executor.submit(fetch, fd, start, min(start + segment_size, size) - 1)
+                           for start in range(0, size, segment_size)]
+                for future in futures:
+                    future.result()
+            os.fsync(fd)
+        except BaseException:
+            os.close(fd)
+            os.remove(part_file)
+            raise
+        os.close(fd)
+        
+        # The segments arrive out of order, so the type and digest are read back afterwards
+        with open(part_file, 'rb') as f:
+            ext = '.twbx' if f.read(len(ZIP_MAGIC)) == ZIP_MAGIC else '.twb'
+            f.seek(0)
+            sha256 = hashlib.file_digest(f, 'sha256').hexdigest()
+        workbook_file = os.path.join(self.temp_dir, f"{safe_filename}{ext}")
+        os.replace(part_file, workbook_file)
+        return workbook_file, sha256
+    
+    def _target_request(self, method, url, body=None):
+        """Send a REST request with a streamed body to the target server and check its status"""
+        server = self.target_server
+        headers = {'X-Tableau-Auth': server.auth_token}
+        if body is not None:
+            headers['Content-Type'] = body.content_type
+        response = server.session.request(method, url, data=body, headers=headers, **server.http_options)
+        if response.status_code >= 400:
+            raise IOError(f"{method} {url} failed with HTTP {response.status_code}: {response.text}")
+        return response
+    
+    def _stream_publish(self, workbook_item, workbook_file, publish_mode):
+        """Publish a workbook file like workbooks.publish, streaming it from disk
+        
+        TSC reads a workbook under 64 MB fully into memory to publish it, and
+        larger ones 50 MB at a time; here the file part is streamed instead.
+        The requests come from _publish_requests, as they do for async transfers.
+        Returns the published WorkbookItem, or None if the response has none.
+        """
+        if os.path.getsize(workbook_file) >= SINGLE_PUBLISH_LIMIT:
+            self.logger.info("Publishing %s through a file upload session (workbook over 64MB)", workbook_file)
+        steps = _publish_requests(self.target_server, workbook_item.name, workbook_item.project_id, workbook_file,
+                                  overwrite=publish_mode == TSC.Server.PublishMode.Overwrite)
+        content = None
+        while True:
+            try:
+                method, url, body = steps.send(content)
+            except StopIteration:
+                return self._published_item(content)
+            content = self._target_request(method, url, body).content
+    
+    def _publish_workbook(self, workbook, workbook_file, target_project_id):
+        """Publish a downloaded workbook to a project on the target server"""
+        # Create a new workbook item with the target project id
+        new_workbook = TSC.WorkbookItem(project_id=target_project_id, name=workbook.name)
+        
+        # Upload to target
+        self.logger.info("Uploading workbook %s to target project %s", workbook.name, target_project_id)
+        
+        # A stat is enough to catch a truncated download, without reading the file back
+        file_size = os.path.getsize(workbook_file)
+        if file_size < 100:
+            raise IOError(f"Downloaded workbook is suspiciously small ({file_size} bytes): {workbook_file}")
+        
+        sha256 = self._file_sha256(workbook_file)
+        if self._content_unchanged(workbook, target_project_id, sha256):
+            return
+        
+        try:
+            # Try with CreateNew instead of Overwrite if there are issues
+            publish_mode = TSC.Server.PublishMode.Overwrite
             
-            # Small delay to ensure file is fully flushed to disk
-            time.sleep(1)
+            self.logger.info("Publishing with mode: %s", publish_mode)
             
-            # Create a new workbook item with the target project id
-            new_workbook = TSC.WorkbookItem(project_id=target_project_id, name=workbook.name)
+            # Check for older version of tableauserverclient
+            if self.skip_data_sources:
+                self.logger.info("Publishing without data source connections (--skip-data-sources enabled)")
+                
+                # For older versions, we can't disable connections, so we'll just publish normally
+                # and warn the user
+                self.logger.warning("Your version of tableauserverclient doesn't support skipping data sources.")
+                self.logger.warning("The workbook will be published with data connections.")
+                self.logger.warning("If this fails due to permissions, you'll need to update tableauserverclient:")
+                self.logger.warning("pip install tableauserverclient --upgrade")
             
-            # Upload to target
-            self.logger.info(f"Uploading workbook {workbook.name} to target project {target_project_id}")
+            # Basic publish with no extra options
+            published = self._stream_publish(new_workbook, workbook_file, publish_mode)
+                
+            self.logger.info("Successfully migrated workbook %s", workbook.name)
+        except Exception as upload_error:
+            self.logger.error("Error publishing workbook: %s", upload_error)
+            self.logger.error("Workbook file exists: %s", os.path.exists(workbook_file))
+            self.logger.error("Workbook file size: %s", os.path.getsize(workbook_file) if os.path.exists(workbook_file) else 'N/A')
+            self.logger.error("Target project exists: %s", target_project_id)
             
+            # Try with different publish mode
             try:
-                # Try with CreateNew instead of Overwrite if there are issues
-                publish_mode = TSC.Server.PublishMode.Overwrite
-                
-                # Make sure the file is accessible and readable
-                with open(workbook_file, 'rb') as file_check:
-                    file_check.read(1024)  # Read a small chunk to verify file is accessible
-                    self.logger.info("File is readable")
-                
-                self.logger.info(f"Publishing with mode: {publish_mode}")
-                
-                # Check for older version of tableauserverclient
-                if self.skip_data_sources:
-                    self.logger.info("Publishing without data source connections (--skip-data-sources enabled)")
-                    
-                    # For older versions, we can't disable connections, so we'll just publish normally
-                    # and warn the user
-                    self.logger.warning("Your version of tableauserverclient doesn't support skipping data sources.")
-                    self.logger.warning("The workbook will be published with data connections.")
-                    self.logger.warning("If this fails due to permissions, you'll need to update tableauserverclient:")
-                    self.logger.warning("pip install tableauserverclient --upgrade")
+                self.logger.info("Trying alternative publish mode...")
+                publish_mode = TSC.Server.PublishMode.CreateNew
+                self.logger.info("Publishing with mode: %s", publish_mode)
                 
                 # Basic publish with no extra options
-                self.target_server.workbooks.publish(new_workbook, workbook_file, publish_mode)
-                    
-                self.logger.info(f"Successfully migrated workbook {workbook.name}")
-            except Exception as upload_error:
-                self.logger.error(f"Error publishing workbook: {str(upload_error)}")
-                self.logger.error(f"Workbook file exists: {os.path.exists(workbook_file)}")
-                self.logger.error(f"Workbook file size: {os.path.getsize(workbook_file) if os.path.exists(workbook_file) else 'N/A'}")
-                self.logger.error(f"Target project exists: {target_project_id}")
-                
-                # Try with different publish mode
-                try:
-                    self.logger.info("Trying alternative publish mode...")
-                    publish_mode = TSC.Server.PublishMode.CreateNew
-                    self.logger.info(f"Publishing with mode: {publish_mode}")
+                published = self._stream_publish(new_workbook, workbook_file, publish_mode)
                     
-                    # Basic publish with no extra options
-                    self.target_server.workbooks.publish(new_workbook, workbook_file, publish_mode)
-                        
-                    self.logger.info(f"Successfully migrated workbook {workbook.name} with alternative mode")
-                except Exception as retry_error:
-                    self.logger.error(f"Alternative publish mode also failed: {str(retry_error)}")
-                    raise
-                    
-        except Exception as e:
-            self.logger.error(f"Migration failed: {str(e)}")
-            raise
-        finally:
-            # Clean up the temp file only if we're not keeping the download directory
-            if workbook_file and os.path.exists(workbook_file) and self.should_delete_temp_dir:
-                try:
-                    os.remove(workbook_file)
-                    self.logger.info(f"Removed temporary file: {workbook_file}")
-                except Exception as cleanup_error:
-                    self.logger.warning(f"Failed to remove temporary file: {str(cleanup_error)}")
+                self.logger.info("Successfully migrated workbook %s with alternative mode", workbook.name)
+            except Exception as retry_error:
+                self.logger.error("Alternative publish mode also failed: %s", retry_error)
+                raise
+        self._record_published(workbook, target_project_id, sha256, published)
+        
+        # The workbook has been sent, so stop it taking up page cache
+        if hasattr(os, 'posix_fadvise'):
+            with open(workbook_file, 'rb') as f:
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+    
+    def _remove_temp_file(self, workbook_file):
+        """Remove a published workbook, unless downloads are being kept"""
+        self._file_digests.pop(workbook_file, None)
+        if workbook_file and os.path.exists(workbook_file) and not self.keep_downloaded_files:
+            try:
+                os.remove(workbook_file)
+                self.logger.info("Removed temporary file: %s", workbook_file)
+            except Exception as cleanup_error:
+                self.logger.warning("Failed to remove temporary file: %s", cleanup_error)
+        
+        with self._disk_space_freed:
+            if self._pending_files.pop(workbook_file, None) is not None:
+                self._disk_space_freed.notify_all()
+    
+    def _over_disk_budget(self):
+        """Whether the workbooks awaiting upload take up more than disk_budget"""
+        return bool(self.disk_budget and not self.keep_downloaded_files and self._pending_files
+                    and sum(self._pending_files.values()) > self.disk_budget)
+    
+    def _wait_for_disk_budget(self):
+        """Block a new download while the workbooks awaiting upload exceed disk_budget"""
+        with self._disk_space_freed:
+            while self._over_disk_budget():
+                self.logger.info("Waiting for uploads to free space in %s", self.temp_dir)
+                self._disk_space_freed.wait()
+    
+    def _track_pending_file(self, workbook_file):
+        """Count a finished download against disk_budget until _remove_temp_file"""
+        if not self.disk_budget or self.keep_downloaded_files:
+            return
+        with self._disk_space_freed:
+            self._pending_files[workbook_file] = os.path.getsize(workbook_file)
+    
+    def _use_thread_servers(self):
+        """Give the current pool thread its own server connections"""
+        if getattr(self._local, 'source_server', None) is None:
+            self._local.source_server = self._clone_server(self._source_server)
+            self._local.target_server = self._clone_server(self._target_server)
     
     def migrate_project(self, source_project_id, target_project_id=None):
         """Migrate all workbooks from a source project to a target project
         
         This is a copy operation - all content remains intact on the source server.
         """
-        if not self.source_server:
-            self.connect_to_source()
-        if not self.target_server:
-            self.connect_to_target()
+        if not self.source_server or not self.target_server:
+            self.connect()
         
         # Get source project details
         source_project = self.source_server.projects.get_by_id(source_project_id)
@@ -446,16 +1450,79 @@ class TableauMigrator:
         # If no target project ID is provided, create or find a matching project
         if not target_project_id:
             target_project = self.ensure_project_exists(source_project.name, source_project.parent_id)
-            target_project_id = target_project.id
+            target_project_id = target_project.id if target_project else None
         
-        # Get all workbooks in the source project
+        # Get all workbooks in the source project, leaving out those already migrated
         workbooks = self.list_workbooks(self.source_server, project_id=source_project_id)
+        workbooks = self._changed_workbooks(workbooks, target_project_id)
+        try:
+            self._migrate_workbooks(workbooks, source_project, target_project_id)
+        finally:
+            self._finish_batch()
         
-        # Migrate each workbook
-        for workbook in workbooks:
-            self.migrate_workbook(workbook.id, source_project, target_project_id)
+        self.logger.info("Successfully migrated %s workbooks from project %s", len(workbooks), source_project.name)
+    
+    def _migrate_workbooks(self, workbooks, source_project, target_project_id):
+        """Copy the listed workbooks of a source project into a target project
         
-        self.logger.info(f"Successfully migrated {len(workbooks)} workbooks from project {source_project.name}")
+        Raises RuntimeError naming the workbooks that failed.
+        """
+        # Migrate the workbooks, several at a time when there is more than one
+        workers = min(self.max_workers, len(workbooks))
+        if workers <= 1:
+            for workbook in workbooks:
+                self._copy_workbook(workbook, source_project, target_project_id)
+        else:
+            # Downloads from the source and uploads to the target run in separate
+            # pools, so both links stay busy. Downloaded files wait in a bounded
+            # queue for an upload slot, which caps how many sit on disk at once.
+            self.logger.info("Migrating %s workbooks with %s parallel downloads and uploads", len(workbooks), workers)
+            failed = []
+            downloaded = queue.Queue(maxsize=workers * 2)
+            upload_slots = threading.Semaphore(workers)
+            
+            def download(wb):
+                try:
+                    self._use_thread_servers()
+                    result = self._download_workbook(wb.id, source_project, wb)
+                except Exception as e:
+                    result = e
+                downloaded.put((wb, result))
+            
+            def publish(workbook, workbook_file):
+                try:
+                    self._use_thread_servers()
+                    self._publish_workbook(workbook, workbook_file, target_project_id)
+                finally:
+                    self._remove_temp_file(workbook_file)
+                    upload_slots.release()
+            
+            with ThreadPoolExecutor(max_workers=workers) as download_pool, \
+                    ThreadPoolExecutor(max_workers=workers) as upload_pool:
+                for wb in workbooks:
+                    download_pool.submit(download, wb)
+                
+                uploads = {}
+                for _ in workbooks:
+                    wb, result = downloaded.get()
+                    if isinstance(result, Exception):
+                        failed.append(wb.name)
+                        self.logger.error("Failed to download workbook %s: %s", wb.name, result)
+                        continue
+                    upload_slots.acquire()
+                    workbook, workbook_file = result
+                    uploads[upload_pool.submit(publish, workbook, workbook_file)] = wb
+                
+                for future in as_completed(uploads):
+                    try:
+                        future.result()
+                    except Exception as e:
+                        failed.append(uploads[future].name)
+                        self.logger.error("Failed to publish workbook %s: %s", uploads[future].name, e)
+            
+            if failed:
+                raise RuntimeError(f"{len(failed)} of {len(workbooks)} workbooks failed to migrate "
+                                   f"from project {source_project.name}: {', '.join(failed)}")
     
     def migrate_site(self, source_site_id=None, target_site_id=None):
         """Migrate all projects and workbooks from a source site to a target site
@@ -467,157 +1534,359 @@ class TableauMigrator:
         target_site_id = target_site_id or self.target_site
         
         # Ensure we're connected to both servers
-        if not self.source_server:
-            self.connect_to_source()
-        if not self.target_server:
-            self.connect_to_target()
+        if not self.source_server or not self.target_server:
+            self.connect()
         
         # Switch to the specified sites if needed
-        if self.source_server.site_id != source_site_id:
-            self.source_server.auth.switch_site(source_site_id)
-        
-        if self.target_server.site_id != target_site_id:
-            self.target_server.auth.switch_site(target_site_id)
+        self._switch_site(self.source_server, source_site_id)
+        self._switch_site(self.target_server, target_site_id)
+        self._prime_target_projects()
         
         # Get all projects in the source site
         source_projects = self.list_projects(self.source_server)
         
         # Create project hierarchy mapping
         project_map = {}
-        
-        # First pass: create all top-level projects
+        children = defaultdict(list)
         for project in source_projects:
-            if not project.parent_id:
-                target_project = self.ensure_project_exists(project.name)
-                project_map[project.id] = target_project.id
-        
-        # Second pass: create all child projects 
-        # This might need multiple passes for deep hierarchies
-        remaining_projects = [p for p in source_projects if p.parent_id]
-        while remaining_projects:
-            projects_handled = []
-            for project in remaining_projects:
-                if project.parent_id in project_map:
-                    # Parent has been created, so we can create this one
-                    target_parent_id = project_map[project.parent_id]
-                    target_project = self.ensure_project_exists(project.name, target_parent_id)
-                    project_map[project.id] = target_project.id
-                    projects_handled.append(project)
-            
-            if not projects_handled:
-                # If we didn't handle any projects in this pass, we have an issue
-                self.logger.error(f"Unable to create project hierarchy for {len(remaining_projects)} projects")
-                break
-                
-            # Remove handled projects from the remaining list
-            remaining_projects = [p for p in remaining_projects if p not in projects_handled]
+            children[project.parent_id or None].append(project)
+        
+        def ensure_target_project(project):
+            self._use_thread_servers()
+            # In a dry run a missing parent isn't created, so neither are its children
+            if project.parent_id and project_map.get(project.parent_id) is None:
+                return None
+            return self.ensure_project_exists(project.name, project_map.get(project.parent_id))
+        
+        # Walk the hierarchy one level at a time, starting from the top-level projects.
+        # Every parent is created before its children, and siblings are created in parallel.
+        layer = children[None]
+        while layer:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(layer))) as executor:
+                target_projects = list(executor.map(ensure_target_project, layer))
+            for project, target_project in zip(layer, target_projects):
+                project_map[project.id] = target_project.id if target_project else None
+            layer = [child for project in layer for child in children.get(project.id, ())]
+        
+        # Projects whose parent isn't on the site can't be placed in the hierarchy.
+        # project_map is a dict, so picking them out is one O(1) lookup per project.
+        unplaced_projects = [p for p in source_projects if p.id not in project_map]
+        if unplaced_projects:
+            self.logger.error("Unable to create project hierarchy for %s projects: %s", len(unplaced_projects),
+                              ", ".join(p.name for p in unplaced_projects))
         
         # Now migrate all projects
         for source_project_id, target_project_id in project_map.items():
+            if target_project_id is None:
+                # Dry run of a project that doesn't exist yet, so every workbook in it is new
+                self._changed_workbooks(self.list_workbooks(self.source_server, project_id=source_project_id), None)
+                continue
             self.migrate_project(source_project_id, target_project_id)
         
-        self.logger.info(f"Successfully migrated site {source_site_id} to {target_site_id}")
+        self.logger.info("Successfully migrated site %s to %s", source_site_id, target_site_id)
     
     def cleanup(self):
         """Clean up temporary files and sign out of servers"""
         # Clean up temp directory
         if self.should_delete_temp_dir:
-            import shutil
             try:
                 if os.path.exists(self.temp_dir):
                     shutil.rmtree(self.temp_dir)
-                    self.logger.info(f"Removed temporary directory: {self.temp_dir}")
+                    self.logger.info("Removed temporary directory: %s", self.temp_dir)
             except Exception as e:
-                self.logger.warning(f"Error cleaning up temporary directory: {str(e)}")
+                self.logger.warning("Error cleaning up temporary directory: %s", e)
         else:
-            self.logger.info(f"Keeping download directory: {self.temp_dir}")
+            self.logger.info("Keeping download directory: %s", self.temp_dir)
+        
+        # Sign out of servers, unless the sessions are cached for the next run
+        if self.token_cache:
+            self.logger.info("Keeping server sessions open for reuse by the next --token-cache run")
+            return
         
-        # Sign out of servers
         try:
             if self.source_server:
                 self.source_server.auth.sign_out()
                 self.logger.info("Signed out of source server")
         except Exception as e:
-            self.logger.warning(f"Error signing out of source server: {str(e)}")
+            self.logger.warning("Error signing out of source server: %s", e)
         
         try:
             if self.target_server:
                 self.target_server.auth.sign_out()
                 self.logger.info("Signed out of target server")
         except Exception as e:
-            self.logger.warning(f"Error signing out of target server: {str(e)}")
+            self.logger.warning("Error signing out of target server: %s", e)
 
     def list_workbooks_by_project_name(self, server, project_name, site=None):
         """List all workbooks in a project identified by name"""
-        if site and server.site_id != site:
+        if site:
             # Switch to the specified site if needed
-            current_site = server.site_id
-            self.logger.info(f"Switching from site {current_site} to {site}")
-            server.auth.switch_site(site)
+            self._switch_site(server, site)
         
-        # First, get all projects to find the one with the matching name
+        # Find projects with matching name (case insensitive) in the cached project list
         try:
-            all_projects = list(TSC.Pager(server.projects))
-            self.logger.info(f"Found {len(all_projects)} projects on site {server.site_id}")
-            
-            # Find projects with matching name (case insensitive)
-            matching_projects = [p for p in all_projects 
-                               if p.name.lower() == project_name.lower()]
+            matching_projects = self._get_projects_by_name(server, project_name)
             
             if not matching_projects:
-                self.logger.error(f"No project found with name: {project_name}")
+                self.logger.error("No project found with name: %s", project_name)
                 return []
             
             if len(matching_projects) > 1:
-                self.logger.warning(f"Multiple projects found with name: {project_name}. Using the first one.")
+                self.logger.warning("Multiple projects found with name: %s. Using the first one.", project_name)
             
             target_project = matching_projects[0]
-            self.logger.info(f"Found project '{target_project.name}' with ID: {target_project.id}")
+            self.logger.info("Found project '%s' with ID: %s", target_project.name, target_project.id)
             
             # Now get workbooks for this project
             return self.list_workbooks(server, site, target_project.id)
             
         except Exception as e:
-            self.logger.error(f"Error listing workbooks by project name: {str(e)}")
+            self.logger.error("Error listing workbooks by project name: %s", e)
             return []
 
     def find_workbook_by_name(self, server, workbook_name, project_id=None, site=None):
         """Find a workbook by name, optionally filtered by project"""
-        if site and server.site_id != site:
+        if site:
             # Switch to the specified site if needed
-            current_site = server.site_id
-            self.logger.info(f"Switching from site {current_site} to {site}")
-            server.auth.switch_site(site)
+            self._switch_site(server, site)
         
         try:
-            # Get all workbooks
-            all_workbooks = self.list_workbooks(server, project_id=project_id)
+            # Ask the server for workbooks with exactly this name first
+            req_option = self._big_page()
+            req_option.filter.add(TSC.Filter(TSC.RequestOptions.Field.Name, 
+                                              TSC.RequestOptions.Operator.Equals, 
+                                              workbook_name))
+            # Pager fetches lazily, so stop once there are two matches: the first is
+            # used, and a second only means there is more than one
+            target_project_id = str(project_id).lower() if project_id else None
+            matching_workbooks = list(itertools.islice(
+                (wb for wb in TSC.Pager(server.workbooks, req_option)
+                 if not target_project_id or wb.project_id == target_project_id), 2))
             
-            # Find workbooks with matching name (case insensitive)
-            matching_workbooks = [wb for wb in all_workbooks 
-                                if wb.name.lower() == workbook_name.lower()]
+            if not matching_workbooks:
+                # Fall back to a case insensitive match over all workbooks
+                matching_workbooks = self._get_workbooks_by_name(server, workbook_name, project_id)
             
             if not matching_workbooks:
-                self.logger.warning(f"No workbook found with name: {workbook_name}")
+                self.logger.warning("No workbook found with name: %s", workbook_name)
                 if project_id:
-                    self.logger.info(f"Available workbooks in project {project_id}:")
-                    for wb in all_workbooks:
-                        self.logger.info(f"  - {wb.name} (ID: {wb.id})")
+                    self.logger.info("Available workbooks in project %s:", project_id)
+                    for wb in self.list_workbooks(server, project_id=project_id):
+                        self.logger.info("  - %s (ID: %s)", wb.name, wb.id)
                 return None
             
             if len(matching_workbooks) > 1:
-                self.logger.warning(f"Multiple workbooks found with name: {workbook_name}. Using the first one.")
+                self.logger.warning("Multiple workbooks found with name: %s. Using the first one.", workbook_name)
             
             target_workbook = matching_workbooks[0]
-            self.logger.info(f"Found workbook '{target_workbook.name}' with ID: {target_workbook.id}")
+            self.logger.info("Found workbook '%s' with ID: %s", target_workbook.name, target_workbook.id)
             
             return target_workbook
             
         except Exception as e:
-            self.logger.error(f"Error finding workbook by name: {str(e)}")
+            self.logger.error("Error finding workbook by name: %s", e)
             return None
 
 
+# Connection settings main() reads from the command line, falling back to the
+# environment (or .env file): TableauMigrator argument -> (variable, default)
+ENV_MAP = {
+    "source_server": ("TABLEAU_SOURCE_SERVER", None),
+    "target_server": ("TABLEAU_TARGET_SERVER", None),
+    "source_site": ("TABLEAU_SOURCE_SITE", ""),
+    "target_site": ("TABLEAU_TARGET_SITE", ""),
+    "source_token_name": ("TABLEAU_SOURCE_TOKEN_NAME", None),
+    "source_token_value": ("TABLEAU_SOURCE_TOKEN_VALUE", None),
+    "source_username": ("TABLEAU_SOURCE_USERNAME", None),
+    "source_password": ("TABLEAU_SOURCE_PASSWORD", None),
+    "target_token_name": ("TABLEAU_TARGET_TOKEN_NAME", None),
+    "target_token_value": ("TABLEAU_TARGET_TOKEN_VALUE", None),
+    "target_username": ("TABLEAU_TARGET_USERNAME", None),
+    "target_password": ("TABLEAU_TARGET_PASSWORD", None),
+    "api_version": ("TABLEAU_API_VERSION", None),
+}
+
+
+def cmd_list_sites(args, migrator):
+    """List the sites on the source server"""
+    sites = migrator.list_source_sites()
+    # Each listing is written in one call rather than a print per row
+    lines = ["\nAvailable sites on source server:"]
+    lines.extend(f"  - {site.name} (ID: {site.id}, URL: {site.content_url})" for site in sites)
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def cmd_list_projects(args, migrator):
+    """List the projects on the source site"""
+    migrator.connect_to_source()
+    projects = migrator.list_projects(migrator.source_server)
+    lines = ["\nAvailable projects on source site:"]
+    for project in projects:
+        parent = f" (Parent ID: {project.parent_id})" if project.parent_id else ""
+        lines.append(f"  - {project.name} (ID: {project.id}){parent}")
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def cmd_list_workbooks(args, migrator):
+    """List the workbooks on the source site, optionally only those in one project"""
+    migrator.connect_to_source()
+    
+    # Get workbooks - either by project ID, project name, or all
+    if args.source_project_id:
+        workbooks = migrator.list_workbooks(migrator.source_server, 
+                                          project_id=args.source_project_id)
+    elif args.source_project_name:
+        workbooks = migrator.list_workbooks_by_project_name(migrator.source_server,
+                                                           args.source_project_name)
+    else:
+        workbooks = migrator.list_workbooks(migrator.source_server)
+    
+    # Include the project ID to help with troubleshooting
+    lines = ["\nAvailable workbooks:"]
+    lines.extend(f"  - {workbook.name} (ID: {workbook.id}, Project ID: {workbook.project_id})"
+                 for workbook in workbooks)
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def _find_source_workbook(args, migrator):
+    """Look up the source project and workbook for --migrate-workbook(-by-name)
+    
+    Returns a ``(source_project_id, workbook_id, workbook)`` tuple; ``workbook`` is
+    None when the workbook was given by ID. Exits when either can't be found.
+    """
+    logger = migrator.logger
+    
+    # Get source project ID - either directly provided or looked up by name
+    source_project_id = args.source_project_id
+    if not source_project_id and args.source_project_name:
+        # Find project by name
+        matching_projects = migrator._get_projects_by_name(migrator.source_server, args.source_project_name)
+        
+        if not matching_projects:
+            logger.error("No project found with name: %s", args.source_project_name)
+            sys.exit(1)
+        
+        if len(matching_projects) > 1:
+            logger.warning("Multiple projects found with name: %s. Using the first one.", args.source_project_name)
+        
+        source_project_id = matching_projects[0].id
+        logger.info("Found source project '%s' with ID: %s", matching_projects[0].name, source_project_id)
+    
+    # If using --migrate-workbook-by-name, look up the workbook ID
+    workbook_id = args.migrate_workbook
+    workbook = None
+    if not workbook_id and args.migrate_workbook_by_name:
+        logger.info("Looking for workbook with name: %s", args.migrate_workbook_by_name)
+        workbook = migrator.find_workbook_by_name(migrator.source_server, 
+                                                 args.migrate_workbook_by_name, 
+                                                 source_project_id)
+        if not workbook:
+            logger.error("Could not find workbook with name: %s", args.migrate_workbook_by_name)
+            sys.exit(1)
+        workbook_id = workbook.id
+        logger.info("Found workbook '%s' with ID: %s", workbook.name, workbook_id)
+    
+    return source_project_id, workbook_id, workbook
+
+
+def cmd_migrate_workbook(args, migrator):
+    """Migrate one workbook, given by ID or by name, looking up its source and target projects"""
+    logger = migrator.logger
+    
+    # For both workbook migration methods, we need a source project
+    if not args.source_project_id and not args.source_project_name:
+        logger.error("Either --source-project-id or --source-project-name is required when migrating a workbook")
+        sys.exit(1)
+        
+    # A password prompt can't run in the background, so sign in up front then
+    if migrator._prompts_for_password('target'):
+        migrator.connect()
+    elif not migrator.source_server:
+        migrator.connect_to_source()
+    
+    # Target sign-in and the target project lookup don't depend on the source
+    # lookups below, so they run in the background meanwhile
+    def prepare_target():
+        if not migrator.target_server:
+            migrator.connect_to_target()
+        if not args.target_project_id and args.target_project_name:
+            return migrator._get_projects_by_name(migrator.target_server, args.target_project_name)
+    
+    # Leaving the with block waits for the target side, so cleanup() never runs
+    # while a sign-in is still in flight, even when a source lookup exits
+    with ThreadPoolExecutor(max_workers=1) as target_pool:
+        target_ready = target_pool.submit(prepare_target)
+        try:
+            source_project_id, workbook_id, workbook = _find_source_workbook(args, migrator)
+        except BaseException:
+            # Report a target failure too, rather than lose it behind the source one
+            target_error = target_ready.exception()
+            if target_error:
+                logger.error("Could not prepare the target server: %s", target_error)
+            raise
+        matching_target_projects = target_ready.result()
+    
+    # If target project specified by name, look it up
+    target_project_id = args.target_project_id
+    if not target_project_id and args.target_project_name:
+        if not matching_target_projects:
+            logger.info("No target project found with name: %s. Will create it.", args.target_project_name)
+            # We'll create this project below
+        else:
+            if len(matching_target_projects) > 1:
+                logger.warning("Multiple target projects found with name: %s. Using the first one.", args.target_project_name)
+            
+            target_project_id = matching_target_projects[0].id
+            logger.info("Found target project '%s' with ID: %s", matching_target_projects[0].name, target_project_id)
+    
+    # If target project not specified at all, use same structure as source
+    if not target_project_id and not args.target_project_name:
+        source_project = migrator.source_server.projects.get_by_id(source_project_id)
+        target_project = migrator.ensure_project_exists(source_project.name)
+        target_project_id = target_project.id if target_project else None
+    # If target project specified by name but not found, create it
+    elif not target_project_id and args.target_project_name:
+        target_project = migrator.ensure_project_exists(args.target_project_name)
+        target_project_id = target_project.id if target_project else None
+        
+    migrator.migrate_workbook(workbook_id, source_project_id, target_project_id, workbook)
+
+
+def cmd_migrate_project(args, migrator):
+    """Migrate every workbook in a source project"""
+    migrator.connect()
+    migrator.migrate_project(args.migrate_project, args.target_project_id)
+
+
+def cmd_migrate_site(args, migrator):
+    """Migrate every project and workbook on the source site"""
+    migrator.migrate_site()
+
+
+# Action flag -> the function main() dispatches it to. The flags are mutually
+# exclusive, so exactly one of them is set.
+COMMANDS = (
+    ("list_sites", cmd_list_sites),
+    ("list_projects", cmd_list_projects),
+    ("list_workbooks", cmd_list_workbooks),
+    ("migrate_workbook", cmd_migrate_workbook),
+    ("migrate_workbook_by_name", cmd_migrate_workbook),
+    ("migrate_project", cmd_migrate_project),
+    ("migrate_site", cmd_migrate_site),
+)
+
+
+def _validate_migration_args(args, config, parser):
+    """Check that migration actions have a target server and target credentials"""
+    if not (args.migrate_workbook or args.migrate_workbook_by_name or args.migrate_project or args.migrate_site):
+        return
+    if not config["target_server"]:
+        parser.error("Target server must be provided via --target-server or TABLEAU_TARGET_SERVER "
+                     "environment variable for migration operations")
+    if not (config["target_token_name"] or config["target_username"]):
+        parser.error("Target authentication must be provided for migration operations")
+
+
 def main():
     parser = argparse.ArgumentParser(description="Migrate workbooks between Tableau servers")
     
@@ -640,6 +1909,30 @@ def main():
                         help="Include data extract when downloading workbooks (may make file larger)")
     parser.add_argument("--skip-data-sources", action="store_true",
                         help="Skip data source connections when publishing (helps with permission issues)")
+    parser.add_argument("--parallel", "--parallelism", type=int, default=8, metavar="N",
+                        help="Number of workbooks to migrate at once in project and site migrations (default: 8)")
+    parser.add_argument("--keep-files", action="store_true",
+                        help="Keep each workbook in --download-dir after it is published, and reuse it "
+                             "on later runs while unchanged (default: delete it once published)")
+    parser.add_argument("--disk-budget-mb", type=int, metavar="MB",
+                        help="Pause new downloads while workbooks waiting to be published take up more than this")
+    parser.add_argument("--download-segments", type=int, default=1, metavar="N",
+                        help="Download each workbook over 64MB with N parallel range requests (default: 1)")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="Copy workbooks in project and site migrations over aiohttp, --parallel at a time "
+                             "(requires aiohttp)")
+    parser.add_argument("--skip-unchanged", action="store_true",
+                        help="Skip workbooks unchanged since an earlier --skip-unchanged run migrated them, "
+                             "recording migrated workbooks in ~/.tableau_migrator/published.json "
+                             "(default: migrate every workbook)")
+    parser.add_argument("--force", action="store_true",
+                        help="With --skip-unchanged, migrate every workbook anyway, still recording them for later runs")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Only report which projects would be created and which workbooks migrated")
+    parser.add_argument("--token-cache", action="store_true",
+                        help="Reuse sign-ins from earlier runs and keep this run's sessions open for later ones, "
+                             "caching their auth tokens in ~/.tableau_migrator/tokens.json "
+                             "(default: sign in afresh and sign out when done)")
     parser.add_argument("--env-file", default=".env",
                         help="Path to .env file for credentials (default: .env in current directory)")
     
@@ -694,210 +1987,83 @@ def main():
                       help="Target project ID (optional for --migrate-workbook and --migrate-project)")
     parser.add_argument("--target-project-name", "-tpname",
                       help="Target project name (alternative to --target-project-id)")
-    parser.add_argument("--verbosity", "-v", choices=["debug", "info", "warning", "error"],
+    parser.add_argument("--verbosity", "-v", choices=list(LEVELS),
                       default="info", help="Logging verbosity")
     
     args = parser.parse_args()
     
-    # Load environment variables from .env file if available
-    if DOTENV_AVAILABLE:
-        env_file = args.env_file
-        if os.path.exists(env_file):
-            load_dotenv(env_file)
-            print(f"Loaded environment variables from {env_file}")
-        else:
-            print(f"Warning: Environment file {env_file} not found")
+    # Load environment variables from .env file if available. dotenv is only
+    # imported when there is a file to load.
+    env_file = args.env_file
+    if not os.path.exists(env_file):
+        print(f"Warning: Environment file {env_file} not found")
     else:
-        print("Warning: python-dotenv not installed. Cannot load .env file.")
-        print("Install with: pip install python-dotenv")
+        try:
+            from dotenv import load_dotenv
+        except ImportError:
+            print("Warning: python-dotenv not installed. Cannot load .env file.")
+            print("Install with: pip install python-dotenv")
+        else:
+            # Variables already set in the environment take precedence over the file
+            load_dotenv(env_file, override=False)
+            print(f"Loaded environment variables from {env_file}")
     
     # Use arguments if provided, otherwise try environment variables
-    source_server = args.source_server or os.environ.get("TABLEAU_SOURCE_SERVER")
-    target_server = args.target_server or os.environ.get("TABLEAU_TARGET_SERVER")
-    source_site = args.source_site or os.environ.get("TABLEAU_SOURCE_SITE", "")
-    target_site = args.target_site or os.environ.get("TABLEAU_TARGET_SITE", "")
-    
-    # Source auth
-    source_token_name = args.source_token_name or os.environ.get("TABLEAU_SOURCE_TOKEN_NAME")
-    source_token_value = args.source_token_value or os.environ.get("TABLEAU_SOURCE_TOKEN_VALUE")
-    source_username = args.source_username or os.environ.get("TABLEAU_SOURCE_USERNAME")
-    source_password = args.source_password or os.environ.get("TABLEAU_SOURCE_PASSWORD")
-    
-    # Target auth
-    target_token_name = args.target_token_name or os.environ.get("TABLEAU_TARGET_TOKEN_NAME")
-    target_token_value = args.target_token_value or os.environ.get("TABLEAU_TARGET_TOKEN_VALUE")
-    target_username = args.target_username or os.environ.get("TABLEAU_TARGET_USERNAME")
-    target_password = args.target_password or os.environ.get("TABLEAU_TARGET_PASSWORD")
-    
-    # API Version
-    api_version = args.api_version or os.environ.get("TABLEAU_API_VERSION")
+    config = {name: getattr(args, name) or os.environ.get(env_var, default)
+              for name, (env_var, default) in ENV_MAP.items()}
     
     # Validate required parameters
-    if not source_server:
+    if args.parallel < 1:
+        parser.error("--parallel must be at least 1")
+    if args.download_segments < 1:
+        parser.error("--download-segments must be at least 1")
+    if args.use_async:
+        from async_migrator import AIOHTTP_AVAILABLE
+        if not AIOHTTP_AVAILABLE:
+            parser.error("--async requires aiohttp. Install with: pip install aiohttp")
+    
+    if not config["source_server"]:
         parser.error("Source server must be provided via --source-server or TABLEAU_SOURCE_SERVER environment variable")
     
     # Source auth validation
-    if not (source_token_name or source_username):
+    if not (config["source_token_name"] or config["source_username"]):
         parser.error("Source authentication must be provided via command line arguments or environment variables")
     
-    # Target auth validation for migration operations
-    if (args.migrate_workbook or args.migrate_workbook_by_name or args.migrate_project or args.migrate_site):
-        if not target_server:
-            parser.error("Target server must be provided for migration operations")
-        if not (target_token_name or target_username):
-            parser.error("Target authentication must be provided for migration operations")
-    
-    # Check that target server is provided for migration operations
-    if (args.migrate_workbook or args.migrate_workbook_by_name or args.migrate_project or args.migrate_site) and not target_server:
-        parser.error("--target-server is required for migration operations")
+    _validate_migration_args(args, config, parser)
     
     # Set up logging
-    logging_level = getattr(logging, args.verbosity.upper())
-    logger = logging.getLogger('tableau_migrator')
-    logger.setLevel(logging_level)
-    handler = logging.StreamHandler()
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
+    logger = _setup_logger(LEVELS[args.verbosity])
     
     # Create migrator
-    migrator = TableauMigrator(
-        source_server=source_server,
-        target_server=target_server,
-        source_site=source_site,
-        target_site=target_site,
+    migrator_class = TableauMigrator
+    if args.use_async:
+        from async_migrator import AsyncTableauMigrator as migrator_class
+    migrator = migrator_class(
+        **config,
         logger=logger,
-        source_token_name=source_token_name,
-        source_token_value=source_token_value,
-        target_token_name=target_token_name,
-        target_token_value=target_token_value,
-        source_username=source_username,
-        source_password=source_password,
-        target_username=target_username,
-        target_password=target_password,
         verify_ssl=not args.no_ssl_verify,
-        api_version=api_version,
         download_dir=args.download_dir,
         include_extract=args.include_extract,
-        skip_data_sources=args.skip_data_sources
+        skip_data_sources=args.skip_data_sources,
+        max_workers=args.parallel,
+        cache_tokens=args.token_cache,
+        keep_files=args.keep_files,
+        disk_budget=args.disk_budget_mb * 1024 * 1024 if args.disk_budget_mb else None,
+        download_segments=args.download_segments,
+        skip_unchanged=args.skip_unchanged,
+        force=args.force,
+        dry_run=args.dry_run
     )
     
     try:
         # Execute requested action
-        if args.list_sites:
-            sites = migrator.list_source_sites()
-            print("\nAvailable sites on source server:")
-            for site in sites:
-                print(f"  - {site.name} (ID: {site.id}, URL: {site.content_url})")
-        
-        elif args.list_projects:
-            migrator.connect_to_source()
-            projects = migrator.list_projects(migrator.source_server)
-            print("\nAvailable projects on source site:")
-            for project in projects:
-                parent = f" (Parent ID: {project.parent_id})" if project.parent_id else ""
-                print(f"  - {project.name} (ID: {project.id}){parent}")
-        
-        elif args.list_workbooks:
-            migrator.connect_to_source()
-            
-            # Get workbooks - either by project ID, project name, or all
-            if args.source_project_id:
-                workbooks = migrator.list_workbooks(migrator.source_server, 
-                                                  project_id=args.source_project_id)
-            elif args.source_project_name:
-                workbooks = migrator.list_workbooks_by_project_name(migrator.source_server,
-                                                                   args.source_project_name)
-            else:
-                workbooks = migrator.list_workbooks(migrator.source_server)
-            
-            print("\nAvailable workbooks:")
-            for workbook in workbooks:
-                # Print project ID to help with troubleshooting
-                print(f"  - {workbook.name} (ID: {workbook.id}, Project ID: {workbook.project_id})")
-        
-        elif args.migrate_workbook or args.migrate_workbook_by_name:
-            # For both workbook migration methods, we need a source project
-            if not args.source_project_id and not args.source_project_name:
-                logger.error("Either --source-project-id or --source-project-name is required when migrating a workbook")
-                sys.exit(1)
-                
-            migrator.connect_to_source()
-            migrator.connect_to_target()
-            
-            # Get source project ID - either directly provided or looked up by name
-            source_project_id = args.source_project_id
-            if not source_project_id and args.source_project_name:
-                # Find project by name
-                all_projects = list(TSC.Pager(migrator.source_server.projects))
-                matching_projects = [p for p in all_projects 
-                                   if p.name.lower() == args.source_project_name.lower()]
-                
-                if not matching_projects:
-                    logger.error(f"No project found with name: {args.source_project_name}")
-                    sys.exit(1)
-                
-                if len(matching_projects) > 1:
-                    logger.warning(f"Multiple projects found with name: {args.source_project_name}. Using the first one.")
-                
-                source_project_id = matching_projects[0].id
-                logger.info(f"Found source project '{matching_projects[0].name}' with ID: {source_project_id}")
-            
-            # If using --migrate-workbook-by-name, look up the workbook ID
-            workbook_id = args.migrate_workbook
-            if not workbook_id and args.migrate_workbook_by_name:
-                logger.info(f"Looking for workbook with name: {args.migrate_workbook_by_name}")
-                workbook = migrator.find_workbook_by_name(migrator.source_server, 
-                                                         args.migrate_workbook_by_name, 
-                                                         source_project_id)
-                if not workbook:
-                    logger.error(f"Could not find workbook with name: {args.migrate_workbook_by_name}")
-                    sys.exit(1)
-                workbook_id = workbook.id
-                logger.info(f"Found workbook '{workbook.name}' with ID: {workbook_id}")
-            
-            # If target project specified by name, look it up
-            target_project_id = args.target_project_id
-            if not target_project_id and args.target_project_name:
-                # Find project by name
-                all_target_projects = list(TSC.Pager(migrator.target_server.projects))
-                matching_target_projects = [p for p in all_target_projects 
-                                         if p.name.lower() == args.target_project_name.lower()]
-                
-                if not matching_target_projects:
-                    logger.info(f"No target project found with name: {args.target_project_name}. Will create it.")
-                    # We'll create this project below
-                else:
-                    if len(matching_target_projects) > 1:
-                        logger.warning(f"Multiple target projects found with name: {args.target_project_name}. Using the first one.")
-                    
-                    target_project_id = matching_target_projects[0].id
-                    logger.info(f"Found target project '{matching_target_projects[0].name}' with ID: {target_project_id}")
-            
-            # If target project not specified at all, use same structure as source
-            if not target_project_id and not args.target_project_name:
-                source_project = migrator.source_server.projects.get_by_id(source_project_id)
-                target_project = migrator.ensure_project_exists(source_project.name)
-                target_project_id = target_project.id
-            # If target project specified by name but not found, create it
-            elif not target_project_id and args.target_project_name:
-                target_project = migrator.ensure_project_exists(args.target_project_name)
-                target_project_id = target_project.id
-                
-            migrator.migrate_workbook(workbook_id, source_project_id, target_project_id)
-        
-        elif args.migrate_project:
-            migrator.connect_to_source()
-            migrator.connect_to_target()
-            migrator.migrate_project(args.migrate_project, args.target_project_id)
-        
-        elif args.migrate_site:
-            migrator.migrate_site()
+        command = next(func for flag, func in COMMANDS if getattr(args, flag))
+        command(args, migrator)
     
     finally:
         # Only clean up source server for listing operations
         if args.list_sites or args.list_projects or args.list_workbooks:
-            if migrator.source_server:
+            if migrator.source_server and not migrator.token_cache:
                 migrator.source_server.auth.sign_out()
                 migrator.logger.info("Signed out of source server") 
         else: